@@ -15,88 +15,118 @@ Usage:
 The CLI uses Click, a Python library for building command-line tools.
 """
 
+# perf: do not @jit - every command here is Click parsing, SQLite queries and
+# printing text. Startup time matters most, so keep heavy imports inside the
+# commands that need them instead of reaching for a compiler like Numba.
+
+import re
 import click
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta
 from pathlib import Path
-from tabulate import tabulate
-
-from .database import init_database
-from .models import (
-    add_medication,
-    get_all_medications,
-    get_medication_by_name,
-    get_medication_by_id,
-    update_medication,
-    deactivate_medication,
-    log_dose,
-    get_medication_status_today,
-    get_last_dose,
-    format_timedelta,
-)
-from .schedules import (
-    add_schedule,
-    get_schedule,
-    get_all_active_schedules,
-    delete_schedule,
-    get_scheduled_times_for_today,
-    get_next_scheduled_dose,
-    format_schedule,
-)
-from .reminders import (
-    send_test_message,
-    send_medication_reminder,
-    format_upcoming_reminders,
-)
-from .symptoms import (
-    log_symptom,
-    log_quick_state,
-    get_symptoms_today,
-    get_latest_symptom,
-    get_on_off_summary_today,
-    format_symptom_entry,
-    SYMPTOM_DESCRIPTIONS,
-)
-from .sleep import (
-    log_sleep_start,
-    log_wake,
-    log_sleep_session,
-    get_open_sleep_record,
-    get_last_sleep,
-    get_sleep_logs,
-    get_sleep_stats,
-    format_sleep_entry,
-    format_duration,
-    calculate_duration,
-)
-from .exercise import (
-    log_exercise,
-    get_exercise_today,
-    get_exercise_logs,
-    get_exercise_stats,
-    get_today_stats,
-    format_exercise_entry,
-    format_duration_friendly,
-    COMMON_EXERCISES,
-    INTENSITY_LEVELS,
-)
 from . import config
+from .formatting import fmt_clock, fmt_day
+
+
+# ============================================================
+# DISPLAY HELPERS
+# ============================================================
+
+# A 24-hour "HH:MM" time, e.g. "08:00" or "8:00" (but not "8:5" or "25:00")
+_TIME_RE = re.compile(r'\s*([01]?\d|2[0-3]):([0-5]\d)\s*$')
+
+
+# ============================================================
+# FORM INPUT
+# Set PD_TRACKER_FORM=1 to fill in the interactive log commands as one
+# form in your $EDITOR, instead of answering one prompt at a time
+# ============================================================
+
+def _edit_form(fields: dict):
+    """
+    Ask all of a command's questions at once in the user's text editor.
+
+    Only used when PD_TRACKER_FORM is set and we're at a terminal.
+    Otherwise the normal prompts are used.
+
+    Args:
+        fields: Question label -> default answer, in the order to show them
+
+    Returns:
+        Dict of label -> answer text, {} when forms are turned off, or None
+        if the editor was closed without saving
+    """
+    import os
+    import sys
+
+    if not (os.environ.get("PD_TRACKER_FORM") and sys.stdin.isatty()):
+        return {}
+
+    template = "# Fill in the answers, then save and close.\n"
+    template += "".join(f"{label}: {default}\n" for label, default in fields.items())
+
+    text = click.edit(template)
+    if text is None:
+        return None
+
+    # Each line looks like "Label: answer" - anything else is ignored
+    answers = dict(fields)
+    for line in text.splitlines():
+        if line.startswith('#') or ':' not in line:
+            continue
+        label, _, value = line.partition(':')
+        if label.strip() in answers:
+            answers[label.strip()] = value.strip()
+    return answers
+
+
+def _ask(answers: dict, label: str, text: str, **kwargs):
+    """
+    Get one answer: from the filled-in form if there is one, otherwise by
+    prompting. kwargs are passed to click.prompt (type, default, ...).
+    """
+    if not answers:
+        return click.prompt(text, **kwargs)
+
+    value = answers[label]
+    if 'type' in kwargs:
+        # Same conversion (and error message) click.prompt would use
+        value = click.types.convert_type(kwargs['type']).convert(value, None, None)
+    return value
 
 
 # ============================================================
 # MAIN CLI GROUP
 # ============================================================
 
+def _ensure_database(ctx, skip=()):
+    """
+    Create the database tables before a command that needs them runs.
+
+    Args:
+        ctx: Click context of the group being invoked
+        skip: Subcommand names that never touch the database
+    """
+    if ctx.invoked_subcommand in skip:
+        return
+
+    from .database import init_database
+    init_database()
+
+
 @click.group()
 @click.version_option(version="0.1.0", prog_name="PD Tracker")
-def cli():
+@click.pass_context
+def cli(ctx):
     """
     PD Tracker - Parkinson's Disease Management Tool
 
     Track medications, symptoms, sleep, and exercise.
     """
-    # Ensure database exists whenever CLI runs
-    # This is silent if tables already exist
-    init_database()
+    # Ensure database exists before any command that uses it.
+    # The reminder and report groups decide for themselves (some of their
+    # commands only read config), while web and backup manage the database
+    # file on their own.
+    _ensure_database(ctx, skip=("reminder", "report", "web", "backup"))
 
 
 # ============================================================
@@ -116,6 +146,8 @@ def med():
               help="Special instructions")
 def med_add(name, dosage, instructions):
     """Add a new medication to track."""
+    from .models import add_medication
+
     # Convert empty strings to None for cleaner database storage
     dosage = dosage if dosage else None
     instructions = instructions if instructions else None
@@ -132,6 +164,8 @@ def med_add(name, dosage, instructions):
 @click.option("--all", "-a", "show_all", is_flag=True, help="Show inactive medications too")
 def med_list(show_all):
     """List all medications."""
+    from .models import get_all_medications
+
     medications = get_all_medications(active_only=not show_all)
 
     if not medications:
@@ -151,10 +185,24 @@ def med_list(show_all):
         ])
 
     # Print as a nice table
+    # Each column is as wide as its longest value; numbers line up on the right
     headers = ["ID", "Name", "Dosage", "Instructions", "Status"]
-    click.echo("\nMedications:")
-    click.echo(tabulate(table_data, headers=headers, tablefmt="simple"))
-    click.echo()
+    widths = [max(len(str(row[i])) for row in table_data + [headers])
+              for i in range(len(headers))]
+
+    def format_row(row):
+        cells = []
+        for cell, width in zip(row, widths):
+            if isinstance(cell, int):
+                cells.append(f"{cell:>{width}}")
+            else:
+                cells.append(f"{cell:<{width}}")
+        return "  ".join(cells).rstrip()
+
+    lines = ["\nMedications:", format_row(headers),
+             "  ".join("-" * w for w in widths)]
+    lines.extend(format_row(row) for row in table_data)
+    click.echo("\n".join(lines) + "\n")
 
 
 @med.command("take")
@@ -171,6 +219,8 @@ def med_take(medication, notes):
         pd med take "sinemet cr"
         pd med take 1
     """
+    from .models import get_all_medications, get_medication_by_id, get_medication_by_name, log_dose
+
     # If no medication specified, show interactive picker
     if not medication:
         medications = get_all_medications()
@@ -210,7 +260,7 @@ def med_take(medication, notes):
     taken_time = datetime.now()
     dose_id = log_dose(med["id"], taken_time=taken_time, notes=notes)
 
-    time_str = taken_time.strftime("%I:%M %p")  # e.g., "02:30 PM"
+    time_str = fmt_clock(taken_time)  # e.g., "2:30 PM"
     click.echo(f"\n✓ Logged: {med['name']}")
     if med['dosage']:
         click.echo(f"  Dosage: {med['dosage']}")
@@ -220,6 +270,70 @@ def med_take(medication, notes):
     click.echo()
 
 
+@med.command("import")
+@click.argument("csv_file", type=click.Path(exists=True, dir_okay=False))
+def med_import(csv_file):
+    """
+    Import past doses from a CSV file.
+
+    The file needs a header row with medication_name and taken_time
+    (e.g. "2024-01-15 08:00") columns; scheduled_time and notes are
+    optional. Each medication must already exist ('pd med add'). A
+    medications CSV made by 'pd report generate' can be imported as-is;
+    rows marked as skipped doses are left out.
+
+    Example:
+        pd med import old_doses.csv
+    """
+    import csv
+    from .models import get_all_medications, log_doses_bulk
+
+    # Match names without caring about upper/lower case
+    med_ids = {m['name'].lower(): m['id'] for m in get_all_medications(active_only=False)}
+
+    rows = []
+    skipped = 0
+
+    with open(csv_file, newline='') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or not {'medication_name', 'taken_time'} <= set(reader.fieldnames):
+            click.echo("CSV needs a header row with medication_name and taken_time columns.")
+            return
+
+        # Line 1 is the header, so data starts on line 2
+        for line_num, row in enumerate(reader, start=2):
+            if (row.get('skipped') or '').strip() == '1':
+                skipped += 1
+                continue
+
+            name = row['medication_name'].strip()
+            if name.lower() not in med_ids:
+                click.echo(f"Line {line_num}: medication '{name}' not found - nothing was imported.")
+                click.echo("Use 'pd med add' to add it first.")
+                return
+            try:
+                taken_time = datetime.fromisoformat(row['taken_time'].strip())
+                scheduled_time = (row.get('scheduled_time') or '').strip()
+                scheduled_time = datetime.fromisoformat(scheduled_time) if scheduled_time else None
+            except ValueError:
+                click.echo(f"Line {line_num}: couldn't read this row - nothing was imported.")
+                return
+            notes = (row.get('notes') or '').strip() or None
+            rows.append((med_ids[name.lower()], taken_time, scheduled_time, notes))
+
+    if not rows:
+        click.echo("\nNo doses found to import.\n")
+        return
+
+    # All rows are saved in one transaction
+    dose_ids = log_doses_bulk(rows)
+
+    click.echo(f"\n✓ Imported {len(dose_ids)} dose(s)")
+    if skipped:
+        click.echo(f"  Skipped {skipped} record(s) marked as skipped doses")
+    click.echo()
+
+
 @med.command("status")
 def med_status():
     """
@@ -228,35 +342,54 @@ def med_status():
     This answers: "Did I take my meds?"
     Shows all active medications and when you last took each one.
     """
-    status = get_medication_status_today()
+    _render_med_status()
+
+
+def _render_med_status():
+    """
+    Print today's medication status.
+
+    Shared by 'pd med status' and the 'pd status' shortcut, so the
+    shortcut can call it directly instead of going through Click.
+    """
+    from .models import get_medication_status_today, format_timedelta
+
+    now = datetime.now()
+    status = get_medication_status_today(now)
 
     if not status:
         click.echo("No medications found. Use 'pd med add' to add some.")
         return
 
-    click.echo("\n" + "=" * 50)
-    click.echo("  TODAY'S MEDICATION STATUS")
-    click.echo("  " + datetime.now().strftime("%A, %B %d, %Y"))
-    click.echo("=" * 50 + "\n")
+    # Collect the output lines and print them all at once at the end
+    lines = [
+        "",
+        "=" * 50,
+        "  TODAY'S MEDICATION STATUS",
+        "  " + now.strftime("%A, %B %d, %Y"),
+        "=" * 50,
+        "",
+    ]
 
     for med in status:
         name_str = med['name']
         if med['dosage']:
             name_str += f" ({med['dosage']})"
 
-        click.echo(f"  {name_str}")
-        click.echo(f"  ├─ Doses today: {med['doses_today']}")
+        lines.append(f"  {name_str}")
+        lines.append(f"  ├─ Doses today: {med['doses_today']}")
 
         if med['time_since_last']:
             time_ago = format_timedelta(med['time_since_last'])
-            last_time = datetime.fromisoformat(med['last_dose_time']).strftime("%I:%M %p")
-            click.echo(f"  └─ Last dose: {last_time} ({time_ago})")
+            last_time = fmt_clock(med['last_dose_time'])
+            lines.append(f"  └─ Last dose: {last_time} ({time_ago})")
         else:
-            click.echo(f"  └─ Last dose: Not taken today")
+            lines.append("  └─ Last dose: Not taken today")
 
-        click.echo()
+        lines.append("")
 
-    click.echo("Use 'pd med take <name>' to log a dose.\n")
+    lines.append("Use 'pd med take <name>' to log a dose.\n")
+    click.echo("\n".join(lines))
 
 
 @med.command("remove")
@@ -271,6 +404,8 @@ def med_remove(medication):
 
     MEDICATION can be the name or ID.
     """
+    from .models import get_medication_by_id, get_medication_by_name, deactivate_medication
+
     # Find the medication
     try:
         med_id = int(medication)
@@ -304,6 +439,8 @@ def med_edit(medication, name, dosage, instructions):
         pd med edit levodopa --dosage "150mg"
         pd med edit 1 --name "Sinemet CR" --instructions "Take with food"
     """
+    from .models import get_medication_by_id, get_medication_by_name, update_medication
+
     # Find the medication
     try:
         med_id = int(medication)
@@ -334,8 +471,13 @@ def med_edit(medication, name, dosage, instructions):
 
     if update_medication(med["id"], name=name, dosage=dosage, instructions=instructions):
         click.echo(f"\nUpdated medication.")
-        # Show the updated medication
-        updated = get_medication_by_id(med["id"])
+        # Show the updated medication - new values where given, otherwise
+        # the ones we already loaded (no need to read the row back)
+        updated = {
+            'name': name if name is not None else med['name'],
+            'dosage': dosage if dosage is not None else med['dosage'],
+            'instructions': instructions if instructions is not None else med['instructions'],
+        }
         click.echo(f"  Name: {updated['name']}")
         click.echo(f"  Dosage: {updated['dosage'] or '-'}")
         click.echo(f"  Instructions: {updated['instructions'] or '-'}")
@@ -359,30 +501,40 @@ def med_schedule(medication):
         pd med schedule              # Show all schedules
         pd med schedule levodopa     # Set schedule for levodopa
     """
+    from .models import get_medication_by_id, get_medication_by_name
+    from .schedules import (
+        add_schedule,
+        get_schedule,
+        get_all_active_schedules_with_today_times,
+        delete_schedule,
+        get_scheduled_times_for_today,
+        format_schedule,
+    )
+
     # If no medication specified, show all schedules
     if not medication:
-        schedules = get_all_active_schedules()
+        schedules = get_all_active_schedules_with_today_times()
         if not schedules:
             click.echo("\nNo medication schedules set.")
             click.echo("Use 'pd med schedule <medication>' to set one.\n")
             return
 
-        click.echo("\nMedication Schedules:")
-        click.echo("-" * 50)
+        lines = ["\nMedication Schedules:", "-" * 50]
         for sched in schedules:
             name = sched['medication_name']
             if sched['dosage']:
                 name += f" ({sched['dosage']})"
-            click.echo(f"\n  {name}")
-            click.echo(f"  └─ {format_schedule(sched)}")
+            lines.append(f"\n  {name}")
+            lines.append(f"  └─ {format_schedule(sched)}")
 
             # Show today's scheduled times
-            times = get_scheduled_times_for_today(sched['medication_id'])
+            times = sched['today_times']
             if times:
-                time_strs = [t.strftime("%I:%M %p").lstrip('0') for t in times]
-                click.echo(f"     Today: {', '.join(time_strs)}")
+                time_strs = [fmt_clock(t) for t in times]
+                lines.append(f"     Today: {', '.join(time_strs)}")
 
-        click.echo()
+        lines.append("")
+        click.echo("\n".join(lines))
         return
 
     # Find the medication
@@ -419,21 +571,14 @@ def med_schedule(medication):
         click.echo("Example: 08:00, 14:00, 20:00")
         times_input = click.prompt("Times")
 
-        # Parse the times
+        # Parse and validate the times
         times = []
         for t in times_input.split(','):
-            t = t.strip()
-            try:
-                # Validate format
-                hour, minute = map(int, t.split(':'))
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    times.append(f"{hour:02d}:{minute:02d}")
-                else:
-                    click.echo(f"Invalid time: {t}")
-                    return
-            except ValueError:
-                click.echo(f"Invalid time format: {t}")
+            match = _TIME_RE.match(t)
+            if not match:
+                click.echo(f"Invalid time: {t.strip()} (use HH:MM, e.g. 08:00)")
                 return
+            times.append(f"{int(match[1]):02d}:{match[2]}")
 
         add_schedule(med['id'], 'fixed', {'times': times})
         click.echo(f"\nSchedule set for {med['name']}:")
@@ -474,7 +619,7 @@ def med_schedule(medication):
     if times:
         click.echo("\nToday's scheduled times:")
         for t in times:
-            click.echo(f"  {t.strftime('%I:%M %p').lstrip('0')}")
+            click.echo(f"  {fmt_clock(t)}")
     click.echo()
 
 
@@ -483,9 +628,10 @@ def med_schedule(medication):
 # ============================================================
 
 @cli.group()
-def reminder():
+@click.pass_context
+def reminder(ctx):
     """Manage SMS reminders via Twilio."""
-    pass
+    _ensure_database(ctx, skip=("setup", "test"))
 
 
 @reminder.command("setup")
@@ -497,37 +643,44 @@ def reminder_setup():
 @reminder.command("status")
 def reminder_status():
     """Check if Twilio is configured and show upcoming reminders."""
-    click.echo("\n" + "=" * 50)
-    click.echo("  REMINDER STATUS")
-    click.echo("=" * 50)
+    from .schedules import get_all_active_schedules, format_schedule
+
+    lines = ["\n" + "=" * 50, "  REMINDER STATUS", "=" * 50]
 
     # Check Twilio config
     if config.is_twilio_configured():
-        click.echo("\n  Twilio: ✓ Configured")
-        click.echo(f"    From: {config.TWILIO_PHONE_NUMBER}")
-        click.echo(f"    To: {config.USER_PHONE_NUMBER}")
+        lines += [
+            "\n  Twilio: ✓ Configured",
+            f"    From: {config.TWILIO_PHONE_NUMBER}",
+            f"    To: {config.USER_PHONE_NUMBER}",
+        ]
     else:
-        click.echo("\n  Twilio: ✗ Not configured")
         missing = config.get_missing_twilio_config()
-        click.echo(f"    Missing: {', '.join(missing)}")
-        click.echo("    Run 'pd reminder setup' for instructions.")
+        lines += [
+            "\n  Twilio: ✗ Not configured",
+            f"    Missing: {', '.join(missing)}",
+            "    Run 'pd reminder setup' for instructions.",
+        ]
 
-    # Show schedules
+    # Show schedules (one query - schedules are joined with their medications)
     schedules = get_all_active_schedules()
     if schedules:
-        click.echo(f"\n  Active schedules: {len(schedules)}")
-        for sched in schedules:
-            click.echo(f"    • {sched['medication_name']}: {format_schedule(sched)}")
+        lines.append(f"\n  Active schedules: {len(schedules)}")
+        lines += [f"    • {sched['medication_name']}: {format_schedule(sched)}"
+                  for sched in schedules]
     else:
-        click.echo("\n  Active schedules: None")
-        click.echo("    Use 'pd med schedule <name>' to set one.")
+        lines.append("\n  Active schedules: None")
+        lines.append("    Use 'pd med schedule <name>' to set one.")
 
-    click.echo()
+    lines.append("")
+    click.echo("\n".join(lines))
 
 
 @reminder.command("test")
 def reminder_test():
     """Send a test SMS to verify Twilio is working."""
+    from .reminders import send_test_message
+
     if not config.is_twilio_configured():
         click.echo("\nTwilio is not configured.")
         click.echo("Run 'pd reminder setup' for instructions.\n")
@@ -553,6 +706,9 @@ def reminder_send(medication):
 
     MEDICATION can be the name or ID.
     """
+    from .models import get_all_medications, get_medication_by_id, get_medication_by_name
+    from .reminders import send_medication_reminder
+
     if not config.is_twilio_configured():
         click.echo("\nTwilio is not configured.")
         click.echo("Run 'pd reminder setup' for instructions.\n")
@@ -630,8 +786,7 @@ def reminder_start(interval):
 @cli.command("status")
 def quick_status():
     """Quick shortcut for 'pd med status'."""
-    ctx = click.Context(med_status)
-    ctx.invoke(med_status)
+    _render_med_status()
 
 
 # ============================================================
@@ -651,6 +806,8 @@ def symptom_log():
 
     Records on/off state, severity, and individual symptom ratings.
     """
+    from .symptoms import log_symptom
+
     click.echo("\n--- Log Symptoms ---\n")
 
     # On/Off state
@@ -719,12 +876,15 @@ def symptom_quick(state, notes):
         pd symptom quick on
         pd symptom quick off -n "wearing off after 3 hours"
     """
+    from .symptoms import log_quick_state
+
     state_map = {'on': 'on', 'off': 'off', 'trans': 'transitioning'}
     actual_state = state_map[state.lower()]
 
-    symptom_id = log_quick_state(actual_state, notes)
+    now = datetime.now()
+    symptom_id = log_quick_state(actual_state, notes, timestamp=now)
 
-    time_str = datetime.now().strftime("%I:%M %p").lstrip('0')
+    time_str = fmt_clock(now)
     click.echo(f"\n✓ Logged: {actual_state.upper()} at {time_str}")
     if notes:
         click.echo(f"  Notes: {notes}")
@@ -734,54 +894,58 @@ def symptom_quick(state, notes):
 @symptom.command("status")
 def symptom_status():
     """Show today's symptom summary."""
-    summary = get_on_off_summary_today()
+    from .symptoms import get_on_off_summary_today
 
-    click.echo("\n" + "=" * 40)
-    click.echo("  TODAY'S SYMPTOM SUMMARY")
-    click.echo("=" * 40)
+    summary = get_on_off_summary_today()
 
-    click.echo(f"\n  Total entries: {summary['total_entries']}")
-    click.echo(f"  ON states: {summary['on']}")
-    click.echo(f"  OFF states: {summary['off']}")
-    click.echo(f"  Transitioning: {summary['transitioning']}")
+    lines = [
+        "\n" + "=" * 40,
+        "  TODAY'S SYMPTOM SUMMARY",
+        "=" * 40,
+        f"\n  Total entries: {summary['total_entries']}",
+        f"  ON states: {summary['on']}",
+        f"  OFF states: {summary['off']}",
+        f"  Transitioning: {summary['transitioning']}",
+    ]
 
     if summary['last_state']:
-        last_time = datetime.fromisoformat(summary['last_time'])
-        click.echo(f"\n  Last logged: {summary['last_state'].upper()} at {last_time.strftime('%I:%M %p').lstrip('0')}")
+        lines.append(f"\n  Last logged: {summary['last_state'].upper()} at {fmt_clock(summary['last_time'])}")
     else:
-        click.echo("\n  No symptoms logged today.")
+        lines.append("\n  No symptoms logged today.")
 
-    click.echo()
+    lines.append("")
+    click.echo("\n".join(lines))
 
 
 @symptom.command("history")
 @click.option("--days", "-d", default=1, help="Number of days to show (default: 1)")
 def symptom_history(days):
     """Show recent symptom entries."""
-    from datetime import timedelta
+    from .symptoms import get_symptoms_today, get_symptoms_range, format_symptom_entry
 
     if days == 1:
         symptoms = get_symptoms_today()
         title = "TODAY'S SYMPTOMS"
     else:
-        from .symptoms import get_symptoms_range
         start = date.today() - timedelta(days=days-1)
         symptoms = get_symptoms_range(start)
         title = f"SYMPTOMS (Last {days} days)"
 
-    click.echo("\n" + "=" * 40)
-    click.echo(f"  {title}")
-    click.echo("=" * 40)
+    lines = ["", "=" * 40, f"  {title}", "=" * 40]
 
     if not symptoms:
-        click.echo("\n  No symptoms logged.\n")
+        lines.append("\n  No symptoms logged.\n")
+        click.echo("\n".join(lines))
         return
 
+    # Build the whole listing first and print it in one go - one write
+    # instead of two per entry
     for s in symptoms:
-        click.echo()
-        click.echo(format_symptom_entry(s))
+        lines.append("")
+        lines.append(format_symptom_entry(s))
 
-    click.echo()
+    lines.append("")
+    click.echo("\n".join(lines))
 
 
 # ============================================================
@@ -802,16 +966,20 @@ def sleep_start(notes):
 
     Use 'pd sleep wake' when you wake up to complete the record.
     """
+    from .sleep import get_open_sleep_record, log_sleep_start
+
+    now = datetime.now()
+
     # Check if already have an open sleep record
     open_record = get_open_sleep_record()
     if open_record:
-        sleep_time = datetime.fromisoformat(open_record['sleep_time'])
-        click.echo(f"\nYou already have an open sleep record from {sleep_time.strftime('%I:%M %p').lstrip('0')}.")
+        sleep_time = open_record['sleep_time']
+        click.echo(f"\nYou already have an open sleep record from {fmt_clock(sleep_time)}.")
         click.echo("Use 'pd sleep wake' to complete it first.\n")
         return
 
-    sleep_id = log_sleep_start(notes=notes)
-    time_str = datetime.now().strftime("%I:%M %p").lstrip('0')
+    sleep_id = log_sleep_start(sleep_time=now, notes=notes)
+    time_str = fmt_clock(now)
 
     click.echo(f"\n✓ Sleep started at {time_str}")
     click.echo("  Use 'pd sleep wake' when you wake up.")
@@ -829,6 +997,12 @@ def sleep_wake(quality, notes):
 
     Completes the sleep record started with 'pd sleep start'.
     """
+    from .sleep import get_open_sleep_record, log_wake, calculate_duration, format_duration
+
+    # One timestamp for the whole command, so the stored wake time and the
+    # duration shown below agree
+    now = datetime.now()
+
     open_record = get_open_sleep_record()
     if not open_record:
         click.echo("\nNo open sleep record found.")
@@ -839,15 +1013,15 @@ def sleep_wake(quality, notes):
     if quality is None:
         quality = click.prompt("Sleep quality (1-10)", type=int, default=5)
 
-    sleep_id = log_wake(quality=quality, notes=notes)
+    sleep_id = log_wake(wake_time=now, quality=quality, notes=notes)
 
     # Get the completed record for display
-    sleep_time = datetime.fromisoformat(open_record['sleep_time'])
-    wake_time = datetime.now()
+    sleep_time = open_record['sleep_time']
+    wake_time = now
     duration = calculate_duration(sleep_time, wake_time)
 
     click.echo(f"\n✓ Good morning! Sleep logged.")
-    click.echo(f"  Slept: {sleep_time.strftime('%I:%M %p').lstrip('0')} - {wake_time.strftime('%I:%M %p').lstrip('0')}")
+    click.echo(f"  Slept: {fmt_clock(sleep_time)} - {fmt_clock(wake_time)}")
     click.echo(f"  Duration: {format_duration(duration)}")
     click.echo(f"  Quality: {quality}/10")
     if notes:
@@ -862,63 +1036,130 @@ def sleep_log_manual():
 
     Use this when you forgot to use 'pd sleep start/wake'.
     """
-    click.echo("\n--- Log Sleep (Manual Entry) ---\n")
+    from .sleep import log_sleep_session, calculate_duration, format_duration
+
+    answers = _edit_form({
+        "Date": "today",
+        "Sleep": "22:00",
+        "Wake": "07:00",
+        "Quality": "5",
+        "Notes": "",
+    })
+    if answers is None:
+        click.echo("Cancelled.")
+        return
+
+    if not answers:
+        click.echo("\n--- Log Sleep (Manual Entry) ---\n")
 
     # Date
-    date_str = click.prompt("Date (YYYY-MM-DD, or 'today'/'yesterday')", default="today")
+    date_str = _ask(answers, "Date", "Date (YYYY-MM-DD, or 'today'/'yesterday')", default="today")
+    today = date.today()
     if date_str == "today":
-        sleep_date = date.today()
+        sleep_date = today
     elif date_str == "yesterday":
-        sleep_date = date.today() - timedelta(days=1)
+        sleep_date = today - timedelta(days=1)
     else:
         try:
-            sleep_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            sleep_date = date.fromisoformat(date_str)
         except ValueError:
             click.echo("Invalid date format. Use YYYY-MM-DD.")
             return
 
-    # Sleep time
-    sleep_time_str = click.prompt("Sleep time (HH:MM, 24h format)", default="22:00")
+    sleep_time_str = _ask(answers, "Sleep", "Sleep time (HH:MM, 24h format)", default="22:00")
+    wake_time_str = _ask(answers, "Wake", "Wake time (HH:MM, 24h format)", default="07:00")
     try:
-        hour, minute = map(int, sleep_time_str.split(':'))
-        sleep_time = datetime.combine(sleep_date, datetime.min.time().replace(hour=hour, minute=minute))
+        # zfill lets "7:00" through as "07:00", which fromisoformat requires
+        sleep_time = datetime.combine(sleep_date, time.fromisoformat(sleep_time_str.strip().zfill(5)))
+        wake_time = datetime.combine(sleep_date, time.fromisoformat(wake_time_str.strip().zfill(5)))
     except ValueError:
         click.echo("Invalid time format. Use HH:MM.")
         return
 
-    # Wake time (might be next day)
-    wake_time_str = click.prompt("Wake time (HH:MM, 24h format)", default="07:00")
-    try:
-        hour, minute = map(int, wake_time_str.split(':'))
-        wake_time = datetime.combine(sleep_date, datetime.min.time().replace(hour=hour, minute=minute))
-        # If wake time is earlier than sleep time, it's the next day
-        if wake_time <= sleep_time:
-            wake_time += timedelta(days=1)
-    except ValueError:
-        click.echo("Invalid time format. Use HH:MM.")
-        return
+    # If wake time is earlier than sleep time, it's the next day
+    if wake_time <= sleep_time:
+        wake_time += timedelta(days=1)
 
     # Quality
-    quality = click.prompt("Sleep quality (1-10)", type=int, default=5)
+    quality = _ask(answers, "Quality", "Sleep quality (1-10)", type=int, default=5)
 
     # Notes
-    notes = click.prompt("Notes (optional)", default="")
+    notes = _ask(answers, "Notes", "Notes (optional)", default="")
     notes = notes if notes else None
 
     sleep_id = log_sleep_session(sleep_time, wake_time, quality, notes)
     duration = calculate_duration(sleep_time, wake_time)
 
     click.echo(f"\n✓ Sleep logged")
-    click.echo(f"  Date: {sleep_date.strftime('%a, %b %d')}")
-    click.echo(f"  Time: {sleep_time.strftime('%I:%M %p').lstrip('0')} - {wake_time.strftime('%I:%M %p').lstrip('0')}")
+    click.echo(f"  Date: {fmt_day(sleep_date)}")
+    click.echo(f"  Time: {fmt_clock(sleep_time)} - {fmt_clock(wake_time)}")
     click.echo(f"  Duration: {format_duration(duration)}")
     click.echo(f"  Quality: {quality}/10")
     click.echo()
 
 
+@sleep.command("import")
+@click.argument("csv_file", type=click.Path(exists=True, dir_okay=False))
+def sleep_import(csv_file):
+    """
+    Import past sleep sessions from a CSV file.
+
+    The file needs a header row with sleep_time and wake_time columns
+    (e.g. "2024-01-15 22:30"); quality and notes are optional. A sleep CSV
+    made by 'pd report generate' can be imported as-is. Records without a
+    wake time are skipped.
+
+    Example:
+        pd sleep import old_sleep.csv
+    """
+    import csv
+    from .sleep import log_sleep_sessions
+
+    sessions = []
+    skipped = 0
+
+    with open(csv_file, newline='') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or not {'sleep_time', 'wake_time'} <= set(reader.fieldnames):
+            click.echo("CSV needs a header row with sleep_time and wake_time columns.")
+            return
+
+        # Line 1 is the header, so data starts on line 2
+        for line_num, row in enumerate(reader, start=2):
+            if not (row.get('wake_time') or '').strip():
+                skipped += 1
+                continue
+            try:
+                sleep_time = datetime.fromisoformat(row['sleep_time'].strip())
+                wake_time = datetime.fromisoformat(row['wake_time'].strip())
+                quality = (row.get('quality') or '').strip()
+                quality = int(quality) if quality else None
+            except ValueError:
+                click.echo(f"Line {line_num}: couldn't read this row - nothing was imported.")
+                return
+            notes = (row.get('notes') or '').strip() or None
+            sessions.append((sleep_time, wake_time, quality, notes))
+
+    if not sessions:
+        click.echo("\nNo sleep sessions found to import.\n")
+        return
+
+    # All rows are saved in one transaction
+    count = log_sleep_sessions(sessions)
+
+    click.echo(f"\n✓ Imported {count} sleep session(s)")
+    if skipped:
+        click.echo(f"  Skipped {skipped} record(s) without a wake time")
+    click.echo()
+
+
 @sleep.command("status")
 def sleep_status():
     """Show sleep status and recent stats."""
+    from .sleep import get_open_sleep_record, get_last_sleep, get_sleep_stats, format_duration
+
+    now = datetime.now()
+
     # Check for open record
     open_record = get_open_sleep_record()
 
@@ -927,16 +1168,16 @@ def sleep_status():
     click.echo("=" * 40)
 
     if open_record:
-        sleep_time = datetime.fromisoformat(open_record['sleep_time'])
-        duration = datetime.now() - sleep_time
-        click.echo(f"\n  Currently sleeping (started {sleep_time.strftime('%I:%M %p').lstrip('0')})")
+        sleep_time = open_record['sleep_time']
+        duration = now - sleep_time
+        click.echo(f"\n  Currently sleeping (started {fmt_clock(sleep_time)})")
         click.echo(f"  Duration so far: {format_duration(duration)}")
         click.echo("\n  Use 'pd sleep wake' when you wake up.")
     else:
         last = get_last_sleep()
         if last:
-            wake_time = datetime.fromisoformat(last['wake_time'])
-            click.echo(f"\n  Last wake: {wake_time.strftime('%a, %b %d at %I:%M %p').lstrip('0')}")
+            wake_time = last['wake_time']
+            click.echo(f"\n  Last wake: {fmt_day(wake_time)} at {fmt_clock(wake_time)}")
             if last['quality']:
                 click.echo(f"  Quality: {last['quality']}/10")
 
@@ -956,30 +1197,33 @@ def sleep_status():
 @click.option("--days", "-d", default=7, help="Number of days to show (default: 7)")
 def sleep_history(days):
     """Show recent sleep history."""
+    from .sleep import get_sleep_logs, get_sleep_stats, format_sleep_entry
+
     logs = get_sleep_logs(days)
 
-    click.echo("\n" + "=" * 40)
-    click.echo(f"  SLEEP HISTORY (Last {days} days)")
-    click.echo("=" * 40)
+    lines = ["", "=" * 40, f"  SLEEP HISTORY (Last {days} days)", "=" * 40]
 
     if not logs:
-        click.echo("\n  No sleep logged.\n")
+        lines.append("\n  No sleep logged.\n")
+        click.echo("\n".join(lines))
         return
 
+    # Build the whole listing first and print it in one go
     for log in logs:
-        click.echo()
-        click.echo(format_sleep_entry(log))
+        lines.append("")
+        lines.append(format_sleep_entry(log))
 
     # Stats
     stats = get_sleep_stats(days)
     if stats['total_nights'] > 0:
-        click.echo("\n  --- Summary ---")
-        click.echo(f"  Total nights: {stats['total_nights']}")
-        click.echo(f"  Avg duration: {stats['avg_duration_formatted']}")
+        lines.append("\n  --- Summary ---")
+        lines.append(f"  Total nights: {stats['total_nights']}")
+        lines.append(f"  Avg duration: {stats['avg_duration_formatted']}")
         if stats['avg_quality']:
-            click.echo(f"  Avg quality: {stats['avg_quality']}/10")
+            lines.append(f"  Avg quality: {stats['avg_quality']}/10")
 
-    click.echo()
+    lines.append("")
+    click.echo("\n".join(lines))
 
 
 # ============================================================
@@ -1007,14 +1251,32 @@ def exercise_log_cmd(exercise_type, duration_mins, intensity, notes):
         pd exercise log
         pd exercise log -t Walking -d 30 -i moderate
     """
+    from .exercise import log_exercise, COMMON_EXERCISES, COMMON_EXERCISES_MENU
+
+    # With PD_TRACKER_FORM set, ask everything that wasn't given as an
+    # option in one editor form
+    fields = {}
+    if not exercise_type:
+        fields["Type"] = COMMON_EXERCISES[0]
+    if not duration_mins:
+        fields["Duration"] = "30"
+    if not intensity:
+        fields["Intensity"] = "moderate"
+    if notes is None:
+        fields["Notes"] = ""
+    answers = _edit_form(fields) if fields else {}
+    if answers is None:
+        click.echo("Cancelled.")
+        return
+
     # Interactive mode if no options provided
     if not exercise_type:
-        click.echo("\n--- Log Exercise ---\n")
-        click.echo("Exercise type:")
-        for i, ex in enumerate(COMMON_EXERCISES, 1):
-            click.echo(f"  {i:2}. {ex}")
+        if answers:
+            choice = answers["Type"]
+        else:
+            click.echo("\n--- Log Exercise ---\n\nExercise type:\n" + COMMON_EXERCISES_MENU)
 
-        choice = click.prompt("\nChoose (or type custom)", default="1")
+            choice = click.prompt("\nChoose (or type custom)", default="1")
         try:
             idx = int(choice) - 1
             if 0 <= idx < len(COMMON_EXERCISES):
@@ -1027,9 +1289,13 @@ def exercise_log_cmd(exercise_type, duration_mins, intensity, notes):
             exercise_type = choice
 
     if not duration_mins:
-        duration_mins = click.prompt("Duration (minutes)", type=int, default=30)
+        duration_mins = _ask(answers, "Duration", "Duration (minutes)", type=int, default=30)
 
-    if not intensity:
+    if not intensity and answers:
+        intensity = answers["Intensity"].lower()
+        if intensity not in ('light', 'moderate', 'vigorous'):
+            intensity = 'moderate'
+    elif not intensity:
         click.echo("\nIntensity:")
         click.echo("  1. Light (easy, can talk easily)")
         click.echo("  2. Moderate (somewhat hard, can talk)")
@@ -1038,7 +1304,7 @@ def exercise_log_cmd(exercise_type, duration_mins, intensity, notes):
         intensity = ['light', 'moderate', 'vigorous'][int_choice - 1] if 1 <= int_choice <= 3 else 'moderate'
 
     if notes is None:
-        notes = click.prompt("Notes (optional)", default="")
+        notes = _ask(answers, "Notes", "Notes (optional)", default="")
         notes = notes if notes else None
 
     exercise_id = log_exercise(exercise_type, duration_mins, intensity, notes=notes)
@@ -1064,16 +1330,71 @@ def exercise_quick(exercise_type, duration, intensity):
         pd exercise quick Walking 30
         pd exercise quick "Physical Therapy" 45 -i light
     """
+    from .exercise import log_exercise
+
     exercise_id = log_exercise(exercise_type, duration, intensity)
 
     click.echo(f"\n✓ Logged: {exercise_type}, {duration} min, {intensity}")
     click.echo()
 
 
+@exercise.command("import")
+@click.argument("csv_file", type=click.Path(exists=True, dir_okay=False))
+def exercise_import(csv_file):
+    """
+    Import past exercise sessions from a CSV file.
+
+    The file needs a header row with exercise_type, start_time
+    (e.g. "2024-01-15 09:30") and duration_minutes columns; intensity and
+    notes are optional. An exercise CSV made by 'pd report generate' can
+    be imported as-is.
+
+    Example:
+        pd exercise import old_exercise.csv
+    """
+    import csv
+    from .exercise import log_exercises_bulk
+
+    required = {'exercise_type', 'start_time', 'duration_minutes'}
+    records = []
+
+    with open(csv_file, newline='') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or not required <= set(reader.fieldnames):
+            click.echo("CSV needs a header row with exercise_type, start_time and duration_minutes columns.")
+            return
+
+        # Line 1 is the header, so data starts on line 2
+        for line_num, row in enumerate(reader, start=2):
+            exercise_type = row['exercise_type'].strip()
+            try:
+                start_time = datetime.fromisoformat(row['start_time'].strip())
+                duration = int(row['duration_minutes'].strip())
+            except ValueError:
+                exercise_type = None
+            if not exercise_type:
+                click.echo(f"Line {line_num}: couldn't read this row - nothing was imported.")
+                return
+            intensity = (row.get('intensity') or '').strip() or None
+            notes = (row.get('notes') or '').strip() or None
+            records.append((exercise_type, start_time, duration, intensity, notes))
+
+    if not records:
+        click.echo("\nNo exercise sessions found to import.\n")
+        return
+
+    # All rows are saved in one transaction
+    count = log_exercises_bulk(records)
+
+    click.echo(f"\n✓ Imported {count} exercise session(s)\n")
+
+
 @exercise.command("status")
 def exercise_status():
     """Show today's exercise summary."""
-    today = get_today_stats()
+    from .exercise import get_exercise_today_with_stats, format_duration_friendly
+
+    today = get_exercise_today_with_stats()
 
     click.echo("\n" + "=" * 40)
     click.echo("  TODAY'S EXERCISE")
@@ -1089,11 +1410,10 @@ def exercise_status():
     click.echo(f"  Types: {', '.join(today['types'])}")
 
     # Show individual sessions
-    logs = get_exercise_today()
     click.echo("\n  --- Sessions ---")
-    for log in logs:
-        start = datetime.fromisoformat(log['start_time'])
-        click.echo(f"  • {start.strftime('%I:%M %p').lstrip('0')}: {log['exercise_type']} ({log['duration_minutes']}m, {log['intensity']})")
+    for log in today['logs']:
+        start = log['start_time']
+        click.echo(f"  • {fmt_clock(start)}: {log['exercise_type']} ({log['duration_minutes']}m, {log['intensity']})")
 
     click.echo()
 
@@ -1102,33 +1422,36 @@ def exercise_status():
 @click.option("--days", "-d", default=7, help="Number of days to show (default: 7)")
 def exercise_history(days):
     """Show recent exercise history."""
+    from .exercise import get_exercise_logs, get_exercise_stats, format_exercise_entry, format_duration_friendly
+
     logs = get_exercise_logs(days)
 
-    click.echo("\n" + "=" * 40)
-    click.echo(f"  EXERCISE HISTORY (Last {days} days)")
-    click.echo("=" * 40)
+    lines = ["", "=" * 40, f"  EXERCISE HISTORY (Last {days} days)", "=" * 40]
 
     if not logs:
-        click.echo("\n  No exercise logged.\n")
+        lines.append("\n  No exercise logged.\n")
+        click.echo("\n".join(lines))
         return
 
+    # Build the whole listing first and print it in one go
     for log in logs:
-        click.echo()
-        click.echo(format_exercise_entry(log))
+        lines.append("")
+        lines.append(format_exercise_entry(log))
 
     # Stats
     stats = get_exercise_stats(days)
-    click.echo("\n  --- Summary ---")
-    click.echo(f"  Total sessions: {stats['total_sessions']}")
-    click.echo(f"  Total time: {format_duration_friendly(stats['total_minutes'])}")
-    click.echo(f"  Avg per day: {stats['avg_minutes_per_day']} min")
+    lines.append("\n  --- Summary ---")
+    lines.append(f"  Total sessions: {stats['total_sessions']}")
+    lines.append(f"  Total time: {format_duration_friendly(stats['total_minutes'])}")
+    lines.append(f"  Avg per day: {stats['avg_minutes_per_day']} min")
 
     if stats['by_type']:
-        click.echo("\n  By type:")
+        lines.append("\n  By type:")
         for etype, data in stats['by_type'].items():
-            click.echo(f"    {etype}: {data['sessions']} sessions, {data['minutes']} min")
+            lines.append(f"    {etype}: {data['sessions']} sessions, {data['minutes']} min")
 
-    click.echo()
+    lines.append("")
+    click.echo("\n".join(lines))
 
 
 # ============================================================
@@ -1136,9 +1459,10 @@ def exercise_history(days):
 # ============================================================
 
 @cli.group()
-def report():
+@click.pass_context
+def report(ctx):
     """Generate and email reports."""
-    pass
+    _ensure_database(ctx, skip=("email-setup", "email-test", "status"))
 
 
 @report.command("generate")
@@ -1146,7 +1470,9 @@ def report():
               help="Export format (default: pdf)")
 @click.option("--days", "-d", default=7, type=int, help="Number of days to include (default: 7)")
 @click.option("--email/--no-email", default=False, help="Send report via email")
-def report_generate(format, days, email):
+@click.option("--async", "run_async", is_flag=True,
+              help="Build the report in the background and return right away")
+def report_generate(format, days, email, run_async):
     """
     Generate a report for the specified period.
 
@@ -1154,23 +1480,35 @@ def report_generate(format, days, email):
         pd report generate                    # PDF report, last 7 days
         pd report generate -f excel -d 30     # Excel report, last 30 days
         pd report generate --email            # Generate and email PDF
+        pd report generate -d 90 --async      # Build in the background
     """
-    from .export import export_pdf, export_excel, export_csv, EXPORT_DIR
-    from .email_sender import send_report_email, is_email_configured
+    from .email_sender import send_report_email, is_email_configured, close_smtp_session
 
     end_date = date.today()
     start_date = end_date - timedelta(days=days-1)
 
+    if run_async:
+        # Check now - the background worker has no way to tell you later
+        if email and not is_email_configured():
+            click.echo("\nEmail not configured. Run 'pd report email-setup' for instructions.")
+            return
+        _start_background_report(format, start_date, end_date, email)
+        return
+
+    from .export import export_report
+
+    # Log in to the mail server while the report is being built, instead
+    # of waiting for both one after the other
+    session = None
+    if email and is_email_configured():
+        from .email_sender import connect_smtp_in_background
+        session = connect_smtp_in_background()
+
     click.echo(f"\nGenerating {format.upper()} report...")
     click.echo(f"  Period: {start_date} to {end_date}")
 
     try:
-        if format == 'pdf':
-            filepath = export_pdf(start_date, end_date)
-        elif format == 'excel':
-            filepath = export_excel(start_date, end_date)
-        else:
-            filepath = export_csv('all', start_date, end_date)
+        filepath = export_report(format, start_date, end_date)
 
         click.echo(f"\n✓ Report generated: {filepath}")
 
@@ -1180,7 +1518,7 @@ def report_generate(format, days, email):
                 return
 
             click.echo("\nSending via email...")
-            result = send_report_email(filepath)
+            result = send_report_email(filepath, session=session)
 
             if result['success']:
                 click.echo(f"✓ {result['message']}")
@@ -1189,23 +1527,87 @@ def report_generate(format, days, email):
 
     except Exception as e:
         click.echo(f"\n✗ Error generating report: {e}")
+    finally:
+        # Log out of the mail server even if the report failed or was
+        # interrupted (Ctrl+C)
+        close_smtp_session(session)
 
     click.echo()
 
 
+def _start_background_report(format, start_date, end_date, email):
+    """
+    Start 'python -m pd_tracker.export_worker' in its own process.
+
+    The worker keeps running after this command exits and records its
+    result for 'pd report status'.
+    """
+    import subprocess
+    import sys
+    from .export_worker import write_status
+
+    args = [sys.executable, "-m", "pd_tracker.export_worker",
+            str(start_date), str(end_date), format]
+    if email:
+        args.append("--email")
+
+    # Mark it as running before starting, so 'pd report status' right
+    # away doesn't show the previous report
+    write_status(state='running', format=format, start_date=start_date,
+                 end_date=end_date, started=datetime.now())
+
+    subprocess.Popen(
+        args,
+        cwd=config.PROJECT_ROOT,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,  # don't stop when the terminal closes
+    )
+
+    click.echo(f"\nGenerating {format.upper()} report in the background...")
+    click.echo(f"  Period: {start_date} to {end_date}")
+    click.echo("  Check on it with: pd report status\n")
+
+
+@report.command("status")
+def report_status():
+    """Show the status of the last background report."""
+    from .export_worker import read_status
+
+    status = read_status()
+    if not status:
+        click.echo("\nNo background report has been started.")
+        click.echo("Use 'pd report generate --async' to start one.\n")
+        return
+
+    lines = [f"\n{status['format'].upper()} report, {status['start_date']} to {status['end_date']}"]
+    if status['state'] == 'running':
+        lines.append(f"  Still generating (started {status['started'][:16]})")
+    elif status['state'] == 'done':
+        lines.append(f"  ✓ Ready: {status['path']}")
+        if status.get('email'):
+            lines.append(f"  Email: {status['email']}")
+    else:
+        lines.append(f"  ✗ Failed: {status.get('error')}")
+    lines.append("")
+    click.echo("\n".join(lines))
+
+
 @report.command("today")
 def report_today():
     """Show a quick summary of today's data."""
-    med_status = get_medication_status_today()
-    from .symptoms import get_on_off_summary_today
-    from .exercise import get_today_stats
+    from .models import get_today_snapshot
 
-    symptom_summary = get_on_off_summary_today()
-    exercise_stats = get_today_stats()
+    now = datetime.now()
+    snapshot = get_today_snapshot(now)
+    med_status = snapshot['medications']
+    symptom_summary = snapshot['symptoms']
+    exercise_stats = snapshot['exercise']
 
     click.echo("\n" + "=" * 50)
     click.echo("  TODAY'S SUMMARY")
-    click.echo("  " + datetime.now().strftime("%A, %B %d, %Y"))
+    click.echo("  " + now.strftime("%A, %B %d, %Y"))
     click.echo("=" * 50)
 
     # Medications
@@ -1259,22 +1661,36 @@ def report_email_test():
 
 
 @report.command("add-email")
-@click.argument("email")
-@click.option("--name", "-n", default=None, help="Recipient name")
-def report_add_email(email, name):
+@click.argument("emails", nargs=-1, required=True)
+@click.option("--name", "-n", default=None, help="Recipient name (one address only)")
+def report_add_email(emails, name):
     """
-    Add an email recipient for reports.
+    Add one or more email recipients for reports.
 
     Examples:
         pd report add-email doctor@clinic.com -n "Dr. Smith"
         pd report add-email spouse@email.com
+        pd report add-email nurse@clinic.com spouse@email.com
     """
-    from .email_sender import add_recipient
+    from .email_sender import add_recipient, add_recipients_bulk
+
+    if len(emails) == 1:
+        add_recipient(emails[0], name)
+        click.echo(f"\n✓ Added recipient: {emails[0]}")
+        if name:
+            click.echo(f"  Name: {name}")
+        click.echo()
+        return
 
-    add_recipient(email, name)
-    click.echo(f"\n✓ Added recipient: {email}")
     if name:
-        click.echo(f"  Name: {name}")
+        click.echo("--name can only be used when adding one address.")
+        return
+
+    # All addresses are saved in one transaction
+    add_recipients_bulk([(email, None) for email in emails])
+    click.echo(f"\n✓ Added {len(emails)} recipients:")
+    for email in emails:
+        click.echo(f"  • {email}")
     click.echo()
 
 
@@ -1358,22 +1774,20 @@ def backup_create(output):
         pd backup create                      # Auto-named backup in exports/
         pd backup create -o ~/my_backup.db    # Custom location
     """
-    import shutil
-    from .database import DB_PATH
-    from .export import ensure_export_dir
+    from .database import DB_PATH, copy_database
 
     if not DB_PATH.exists():
         click.echo("No database found to backup.")
         return
 
     if output is None:
-        ensure_export_dir()
+        config.EXPORT_DIR.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output = Path(__file__).parent.parent / "exports" / f"pd_tracker_backup_{timestamp}.db"
+        output = config.EXPORT_DIR / f"pd_tracker_backup_{timestamp}.db"
     else:
         output = Path(output)
 
-    shutil.copy2(DB_PATH, output)
+    copy_database(DB_PATH, output)
     size_kb = output.stat().st_size / 1024
 
     click.echo(f"\n✓ Backup created: {output}")
@@ -1392,8 +1806,7 @@ def backup_restore(backup_file):
     Examples:
         pd backup restore ~/my_backup.db
     """
-    import shutil
-    from .database import DB_PATH, DATA_DIR
+    from .database import DB_PATH, DATA_DIR, copy_database
 
     backup_path = Path(backup_file)
 
@@ -1404,38 +1817,49 @@ def backup_restore(backup_file):
     if DB_PATH.exists():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         old_backup = DATA_DIR / f"pre_restore_backup_{timestamp}.db"
-        shutil.copy2(DB_PATH, old_backup)
+        copy_database(DB_PATH, old_backup)
         click.echo(f"  Current data backed up to: {old_backup}")
 
-    # Restore
-    shutil.copy2(backup_path, DB_PATH)
+    # Restore - copying through SQLite (rather than over the file) keeps
+    # any running web server or reminder service from seeing a half-written file
+    copy_database(backup_path, DB_PATH)
     click.echo(f"\n✓ Restored from: {backup_path}\n")
 
 
 @backup.command("list")
 def backup_list():
     """List available backups."""
-    from .export import EXPORT_DIR
+    import heapq
+    import os
 
-    if not EXPORT_DIR.exists():
+    if not config.EXPORT_DIR.exists():
         click.echo("\nNo backups found.\n")
         return
 
-    backups = sorted(EXPORT_DIR.glob("pd_tracker_backup_*.db"), reverse=True)
+    # scandir hands back plain directory entries (no Path object per file),
+    # and we only need the 10 newest - backup names sort by timestamp, so
+    # nlargest picks them without sorting the whole folder
+    with os.scandir(config.EXPORT_DIR) as entries:
+        backups = [
+            e for e in entries
+            if e.name.startswith("pd_tracker_backup_") and e.name.endswith(".db")
+        ]
 
     if not backups:
         click.echo("\nNo backups found.\n")
         return
 
-    click.echo("\nAvailable Backups:")
-    for b in backups[:10]:  # Show last 10
-        size_kb = b.stat().st_size / 1024
-        mtime = datetime.fromtimestamp(b.stat().st_mtime)
-        click.echo(f"  {b.name}  ({size_kb:.1f} KB, {mtime.strftime('%Y-%m-%d %H:%M')})")
+    lines = ["\nAvailable Backups:"]
+    for b in heapq.nlargest(10, backups, key=lambda e: e.name):  # Show last 10
+        st = b.stat()
+        size_kb = st.st_size / 1024
+        mtime = datetime.fromtimestamp(st.st_mtime)
+        lines.append(f"  {b.name}  ({size_kb:.1f} KB, {mtime.strftime('%Y-%m-%d %H:%M')})")
 
     if len(backups) > 10:
-        click.echo(f"  ... and {len(backups) - 10} more")
-    click.echo()
+        lines.append(f"  ... and {len(backups) - 10} more")
+    lines.append("")
+    click.echo("\n".join(lines))
 
 
 # ============================================================
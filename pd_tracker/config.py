@@ -14,6 +14,7 @@ Then run: source ~/.bashrc (or restart your terminal)
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -30,6 +31,9 @@ DATA_DIR = PROJECT_ROOT / "data"
 # Database file path
 DB_PATH = DATA_DIR / "pd_tracker.db"
 
+# Where reports and backups are saved
+EXPORT_DIR = PROJECT_ROOT / "exports"
+
 
 # ============================================================
 # TWILIO CONFIGURATION (for SMS reminders)
@@ -60,13 +64,23 @@ REMINDER_MINUTES_BEFORE = 5
 # How many minutes after a missed dose to send a "did you take it?" follow-up
 FOLLOWUP_MINUTES_AFTER = 15
 
+# How often the reminder service does database upkeep (see optimize_database)
+DB_MAINTENANCE_MINUTES = 15
+
 
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
+@lru_cache(maxsize=1)
 def is_twilio_configured() -> bool:
-    """Check if all Twilio settings are configured."""
+    """
+    Check if all Twilio settings are configured.
+
+    The settings are read once when this module is imported, so the answer
+    can't change while the program runs. It is cached because every reminder
+    command (and every SMS sent) asks again.
+    """
     return all([
         TWILIO_ACCOUNT_SID,
         TWILIO_AUTH_TOKEN,
@@ -7,7 +7,11 @@ This module handles:
 - Providing a connection for other modules to use
 """
 
+import atexit
 import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
 
 
@@ -18,12 +22,142 @@ from pathlib import Path
 DATA_DIR = Path(__file__).parent.parent / "data"
 DB_PATH = DATA_DIR / "pd_tracker.db"
 
+# Version of the table/index layout created by init_database().
+# Bump this whenever you add a table, column or index there, so existing
+# databases run the setup again and pick up the change.
+SCHEMA_VERSION = 3
+
+
+def _convert_timestamp(value: bytes):
+    """
+    Turn a stored TIMESTAMP value back into a datetime.
+
+    Timestamps are still stored as ISO text (e.g. "2024-01-15 08:30:00"),
+    so existing databases keep working. This just parses them once, as
+    rows come out of SQLite, so the rest of the code gets datetime objects
+    and never has to call datetime.fromisoformat() itself.
+    """
+    text = value.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        # Not a timestamp we recognize - hand back the raw text
+        return text
+
+
+# Any column declared as TIMESTAMP in the tables below goes through
+# _convert_timestamp (see detect_types in get_connection), as does any
+# query column named with a "[TIMESTAMP]" suffix
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+
+# And the other direction: datetimes we pass in as query parameters are
+# stored as the same ISO text ("2024-01-15 08:30:00"). Python used to do
+# this on its own, but that default is deprecated, so we say so explicitly.
+sqlite3.register_adapter(datetime, lambda dt: dt.isoformat(" "))
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+
+
+class _SharedConnection(sqlite3.Connection):
+    """
+    The connection handed out by get_connection().
+
+    Each thread keeps one of these open and reuses it, instead of opening
+    (and closing) the database file for every single query. The rest of the
+    code still calls conn.commit() and conn.close() as usual:
+
+    - close() keeps the connection open for the next caller, but throws
+      away anything that was never committed - just like a real close would.
+    - Inside db_batch(), commit() and close() wait so the whole batch is
+      saved in one transaction at the end.
+    """
+
+    # How many db_batch() blocks we're inside (they can be nested)
+    batch_depth = 0
+
+    def commit(self):
+        if self.batch_depth == 0:
+            super().commit()
+
+    def close(self):
+        if self.batch_depth == 0 and self.in_transaction:
+            self.rollback()
+
+
+# One connection per thread - SQLite connections can't be shared between
+# threads (the web server handles each request on its own thread)
+_local = threading.local()
+
+# Set once the data directory has been created (or found), so only the
+# first connection in this process has to check the filesystem for it
+_data_dir_ready = False
+
+
+def _open_connection(**kwargs) -> _SharedConnection:
+    """Open a new connection to the database with our usual settings."""
+    global _data_dir_ready
+
+    # Make sure the data directory exists
+    if not _data_dir_ready:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        _data_dir_ready = True
+
+    # Connect to database (creates file if it doesn't exist)
+    # PARSE_DECLTYPES makes TIMESTAMP columns come back as datetime objects.
+    # PARSE_COLNAMES does the same for computed columns (MAX(), subqueries)
+    # that have no declared type - name them like AS "last [TIMESTAMP]".
+    # The connection is reused, so a bigger statement cache (default 128)
+    # means queries run again are compiled once, not on every call.
+    conn = sqlite3.connect(
+        DB_PATH,
+        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+        factory=_SharedConnection,
+        cached_statements=256,
+        **kwargs
+    )
+
+    # This makes rows return as dict-like objects instead of plain tuples
+    # So you can access columns by name: row['name'] instead of row[0]
+    conn.row_factory = sqlite3.Row
+
+    # Write-ahead logging lets the web server, reminder service and CLI
+    # read while another one writes. The setting is saved in the database
+    # file, so it only has to be switched on once.
+    # With WAL, synchronous=NORMAL is still crash-safe and skips an fsync
+    # on every commit.
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    # If another program is writing, wait up to 5 seconds for it instead
+    # of failing straight away with "database is locked"
+    conn.execute("PRAGMA busy_timeout=5000")
+
+    # Keep temporary tables/sorts in memory, read the file through a
+    # memory map (up to 256 MB - far more than this database will need)
+    # and allow a 64 MB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+
+    return conn
+
 
 def get_connection():
     """
     Get a connection to the database.
 
     Returns a sqlite3 Connection object that you can use to run queries.
+    The connection is opened the first time a thread asks for one and then
+    reused, so calling this (and conn.close()) is cheap.
+
+    Its transactions start with BEGIN IMMEDIATE. Python only begins a
+    transaction at the first INSERT/UPDATE/DELETE, so that is when the
+    write lock is taken (waiting up to busy_timeout if another program is
+    writing). SELECTs run before that first write are not part of the
+    transaction, so another program can still change things between a read
+    and the write that follows it. Code that needs the lock before it
+    reads should use db_batch(), which takes it up front (as
+    init_database() does).
 
     Example usage:
         conn = get_connection()
@@ -32,184 +166,371 @@ def get_connection():
         rows = cursor.fetchall()
         conn.close()
     """
-    # Make sure the data directory exists
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = _local.conn = _open_connection(isolation_level="IMMEDIATE")
+    return conn
 
-    # Connect to database (creates file if it doesn't exist)
-    conn = sqlite3.connect(DB_PATH)
 
-    # This makes rows return as dict-like objects instead of plain tuples
-    # So you can access columns by name: row['name'] instead of row[0]
-    conn.row_factory = sqlite3.Row
+def get_read_connection():
+    """
+    Get a read-only connection to the database.
+
+    Use this instead of get_connection() in functions that only run
+    SELECTs. It is a separate per-thread connection with query_only turned
+    on, so a bug can't write through it. It runs in autocommit mode
+    (isolation_level=None), so it never holds a transaction open. With WAL,
+    its reads don't wait for the CLI or reminder service to finish writing.
+    (Being a separate connection, it won't see writes from a db_batch()
+    block that hasn't finished yet.)
+
+    Every thread gets its own, so the web server's request threads (or an
+    export running alongside the CLI) read in parallel without waiting on
+    each other or on the writer.
 
+    Used exactly like get_connection(), including conn.close().
+    """
+    conn = getattr(_local, 'read_conn', None)
+    if conn is None:
+        conn = _open_connection(isolation_level=None)
+        conn.execute("PRAGMA query_only=1")
+        _local.read_conn = conn
     return conn
 
 
-def init_database():
+def close_connections():
     """
-    Create all the database tables if they don't exist.
+    Really close this thread's cached connections.
 
-    This is safe to run multiple times - it won't delete existing data.
-    The 'IF NOT EXISTS' part of each CREATE TABLE ensures that.
+    Runs automatically when the program exits, so SQLite can fold the
+    write-ahead log back into the database file and tidy up its -wal/-shm
+    files. Safe to call more than once.
+    """
+    for name in ('conn', 'read_conn'):
+        conn = getattr(_local, name, None)
+        if conn is not None:
+            if conn.in_transaction:
+                conn.rollback()
+            if name == 'conn':
+                try:
+                    # Let SQLite refresh its index statistics if the queries
+                    # this program ran would benefit (cheap when nothing changed)
+                    conn.execute("PRAGMA optimize")
+
+                    # Fold the write-ahead log back into the database file and
+                    # empty it. If another program (like the web server) is
+                    # reading right now, don't wait for it - the checkpoint
+                    # simply happens later.
+                    conn.execute("PRAGMA busy_timeout = 0")
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except sqlite3.Error:
+                    pass
+            # Skip our no-op close() and call sqlite3's real one
+            sqlite3.Connection.close(conn)
+            setattr(_local, name, None)
+
+
+atexit.register(close_connections)
+
+
+def optimize_database():
+    """
+    Routine upkeep for programs that keep the database open for a long time.
+
+    The reminder service runs for days, so it never reaches the tidy-up in
+    close_connections(). It calls this every so often instead:
+
+    - PRAGMA optimize refreshes the statistics the query planner uses to
+      pick indexes, as tables like doses_taken and symptoms keep growing.
+    - PRAGMA wal_checkpoint(TRUNCATE) copies the write-ahead log into the
+      database file and empties it, so the -wal file doesn't grow forever.
     """
     conn = get_connection()
-    cursor = conn.cursor()
+    conn.execute("PRAGMA optimize")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
-    # ============================================================
-    # MEDICATIONS TABLE
-    # Stores information about each medication you take
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS medications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            dosage TEXT,
-            instructions TEXT,
-            active INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
 
-    # ============================================================
-    # MEDICATION SCHEDULES TABLE
-    # Each medication can have a schedule for when to take it
-    # schedule_type options:
-    #   - 'on_wake': Take once on waking
-    #   - 'interval_from_wake': Take every X hours after waking (until sleep)
-    #   - 'mid_day': Take once mid-day
-    #   - 'night_wake': Take once if waking during the night
-    #   - 'monthly_injection': Take once every X months
-    #   - 'fixed': Specific times each day (legacy)
-    #   - 'prn': As needed (no reminders)
-    # times: JSON with schedule details
-    # reminders_enabled: Toggle for SMS/email reminders
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS medication_schedules (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            medication_id INTEGER NOT NULL,
-            schedule_type TEXT NOT NULL,
-            times TEXT,
-            active INTEGER DEFAULT 1,
-            reminders_enabled INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (medication_id) REFERENCES medications (id)
-        )
-    """)
+def get_data_version() -> int:
+    """
+    A number that changes whenever another program saves a change.
 
-    # ============================================================
-    # WAKE/SLEEP TRACKING TABLE
-    # Tracks when the user wakes up and goes to sleep
-    # Used to calculate wake-based medication schedules
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS wake_sleep_events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            event_type TEXT NOT NULL,
-            event_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            notes TEXT
-        )
-    """)
+    Much cheaper than a real query (no table is read), so a long-running
+    program like the reminder service can check it often to see whether
+    the CLI or web app logged something since it last looked. Changes
+    saved through this thread's own get_connection() don't change it.
+    """
+    conn = get_connection()
+    return conn.execute("PRAGMA data_version").fetchone()[0]
 
-    # ============================================================
-    # PENDING REMINDERS TABLE
-    # Tracks scheduled reminders that need to be sent
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS pending_reminders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            medication_id INTEGER NOT NULL,
-            scheduled_time TIMESTAMP NOT NULL,
-            reminder_time TIMESTAMP NOT NULL,
-            sent INTEGER DEFAULT 0,
-            followup_sent INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (medication_id) REFERENCES medications (id)
-        )
-    """)
 
-    # ============================================================
-    # DOSES TAKEN TABLE
-    # Records every time you take (or skip) a medication
-    # This is the core tracking data for medication adherence
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS doses_taken (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            medication_id INTEGER NOT NULL,
-            scheduled_time TIMESTAMP,
-            taken_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            skipped INTEGER DEFAULT 0,
-            notes TEXT,
-            FOREIGN KEY (medication_id) REFERENCES medications (id)
-        )
-    """)
+@contextmanager
+def db_batch():
+    """
+    Group several writes into a single transaction.
 
-    # ============================================================
-    # SYMPTOMS TABLE
-    # Tracks your PD symptoms over time
-    # on_off_state: 'on', 'off', or 'transitioning'
-    # Individual symptom scores are 0-10 (0 = not present)
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS symptoms (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            on_off_state TEXT,
-            severity INTEGER,
-            tremor INTEGER DEFAULT 0,
-            rigidity INTEGER DEFAULT 0,
-            bradykinesia INTEGER DEFAULT 0,
-            dyskinesia INTEGER DEFAULT 0,
-            freezing INTEGER DEFAULT 0,
-            balance INTEGER DEFAULT 0,
-            notes TEXT
-        )
-    """)
+    Every log_*/update_* helper normally commits on its own, which means one
+    disk sync per record. Inside this block those commits are held back and
+    everything is saved together at the end - or nothing is, if an error
+    happens part way through.
 
-    # ============================================================
-    # SLEEP LOGS TABLE
-    # Tracks your sleep patterns
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sleep_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            sleep_time TIMESTAMP,
-            wake_time TIMESTAMP,
-            quality INTEGER,
-            notes TEXT,
-            logged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    Example usage:
+        with db_batch():
+            for row in rows:
+                log_sleep_session(...)
+    """
+    conn = get_connection()
+    if conn.batch_depth == 0 and not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    conn.batch_depth += 1
+    try:
+        yield conn
+    except BaseException:
+        conn.batch_depth -= 1
+        if conn.batch_depth == 0:
+            conn.rollback()
+        raise
+    else:
+        conn.batch_depth -= 1
+        if conn.batch_depth == 0:
+            conn.commit()
 
-    # ============================================================
-    # EXERCISE LOGS TABLE
-    # Tracks your physical activity
-    # intensity: 'light', 'moderate', 'vigorous'
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS exercise_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            exercise_type TEXT NOT NULL,
-            start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            duration_minutes INTEGER,
-            intensity TEXT,
-            notes TEXT
-        )
-    """)
 
-    # ============================================================
-    # EMAIL RECIPIENTS TABLE
-    # Stores email addresses for report delivery
-    # ============================================================
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS email_recipients (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT NOT NULL UNIQUE,
-            name TEXT,
-            active INTEGER DEFAULT 1
-        )
-    """)
+def copy_database(source, destination):
+    """
+    Copy one SQLite database file to another using SQLite's backup API.
+
+    Unlike copying the file directly, this is safe while another program
+    (like the web server or reminder service) is writing to the database -
+    SQLite copies a consistent snapshot, including anything still in the
+    write-ahead log.
+
+    Args:
+        source: Path of the database to copy from
+        destination: Path to copy to (its contents are replaced)
+    """
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(destination)
+    try:
+        # Copy 1000 pages at a time so writers aren't locked out for long
+        src.backup(dst, pages=1000)
+    finally:
+        dst.close()
+        src.close()
+
+
+# Every table and index, created in one go by init_database().
+# 'IF NOT EXISTS' makes each statement a no-op when it already exists.
+_SCHEMA_SQL = """
+-- ============================================================
+-- MEDICATIONS TABLE
+-- Stores information about each medication you take
+-- ============================================================
+CREATE TABLE IF NOT EXISTS medications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    dosage TEXT,
+    instructions TEXT,
+    active INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================
+-- MEDICATION SCHEDULES TABLE
+-- Each medication can have a schedule for when to take it
+-- schedule_type options:
+--   - 'on_wake': Take once on waking
+--   - 'interval_from_wake': Take every X hours after waking (until sleep)
+--   - 'mid_day': Take once mid-day
+--   - 'night_wake': Take once if waking during the night
+--   - 'monthly_injection': Take once every X months
+--   - 'fixed': Specific times each day (legacy)
+--   - 'prn': As needed (no reminders)
+-- times: JSON with schedule details
+-- reminders_enabled: Toggle for SMS/email reminders
+-- ============================================================
+CREATE TABLE IF NOT EXISTS medication_schedules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    medication_id INTEGER NOT NULL,
+    schedule_type TEXT NOT NULL,
+    times TEXT,
+    active INTEGER DEFAULT 1,
+    reminders_enabled INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (medication_id) REFERENCES medications (id)
+);
+
+-- ============================================================
+-- WAKE/SLEEP TRACKING TABLE
+-- Tracks when the user wakes up and goes to sleep
+-- Used to calculate wake-based medication schedules
+-- ============================================================
+CREATE TABLE IF NOT EXISTS wake_sleep_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    event_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    notes TEXT
+);
+
+-- ============================================================
+-- PENDING REMINDERS TABLE
+-- Tracks scheduled reminders that need to be sent
+-- ============================================================
+CREATE TABLE IF NOT EXISTS pending_reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    medication_id INTEGER NOT NULL,
+    scheduled_time TIMESTAMP NOT NULL,
+    reminder_time TIMESTAMP NOT NULL,
+    sent INTEGER DEFAULT 0,
+    followup_sent INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (medication_id) REFERENCES medications (id)
+);
+
+-- ============================================================
+-- DOSES TAKEN TABLE
+-- Records every time you take (or skip) a medication
+-- This is the core tracking data for medication adherence
+-- ============================================================
+CREATE TABLE IF NOT EXISTS doses_taken (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    medication_id INTEGER NOT NULL,
+    scheduled_time TIMESTAMP,
+    taken_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    skipped INTEGER DEFAULT 0,
+    notes TEXT,
+    FOREIGN KEY (medication_id) REFERENCES medications (id)
+);
+
+-- ============================================================
+-- SYMPTOMS TABLE
+-- Tracks your PD symptoms over time
+-- on_off_state: 'on', 'off', or 'transitioning'
+-- Individual symptom scores are 0-10 (0 = not present)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS symptoms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    on_off_state TEXT,
+    severity INTEGER,
+    tremor INTEGER DEFAULT 0,
+    rigidity INTEGER DEFAULT 0,
+    bradykinesia INTEGER DEFAULT 0,
+    dyskinesia INTEGER DEFAULT 0,
+    freezing INTEGER DEFAULT 0,
+    balance INTEGER DEFAULT 0,
+    notes TEXT
+);
+
+-- ============================================================
+-- SLEEP LOGS TABLE
+-- Tracks your sleep patterns
+-- ============================================================
+CREATE TABLE IF NOT EXISTS sleep_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sleep_time TIMESTAMP,
+    wake_time TIMESTAMP,
+    quality INTEGER,
+    notes TEXT,
+    logged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================
+-- EXERCISE LOGS TABLE
+-- Tracks your physical activity
+-- intensity: 'light', 'moderate', 'vigorous'
+-- ============================================================
+CREATE TABLE IF NOT EXISTS exercise_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    exercise_type TEXT NOT NULL,
+    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    duration_minutes INTEGER,
+    intensity TEXT,
+    notes TEXT
+);
+
+-- ============================================================
+-- EMAIL RECIPIENTS TABLE
+-- Stores email addresses for report delivery
+-- ============================================================
+CREATE TABLE IF NOT EXISTS email_recipients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL UNIQUE,
+    name TEXT,
+    active INTEGER DEFAULT 1
+);
+
+-- ============================================================
+-- INDEXES
+-- Let SQLite jump straight to matching rows instead of scanning
+-- the whole table
+-- ============================================================
+CREATE INDEX IF NOT EXISTS idx_medications_name
+ON medications (name COLLATE NOCASE);
+
+-- Partial index: only holds sleep records that are still open (normally
+-- at most one), so finding "am I asleep?" doesn't scan every night logged
+CREATE INDEX IF NOT EXISTS idx_sleep_logs_open
+ON sleep_logs (sleep_time) WHERE wake_time IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_exercise_logs_start_time
+ON exercise_logs (start_time);
+
+-- Time columns used by the "today" / "last N days" / export range queries
+CREATE INDEX IF NOT EXISTS idx_doses_taken_taken_time
+ON doses_taken (taken_time);
+CREATE INDEX IF NOT EXISTS idx_doses_taken_medication_id
+ON doses_taken (medication_id, taken_time);
+CREATE INDEX IF NOT EXISTS idx_symptoms_timestamp
+ON symptoms (timestamp);
+CREATE INDEX IF NOT EXISTS idx_sleep_logs_sleep_time
+ON sleep_logs (sleep_time);
+CREATE INDEX IF NOT EXISTS idx_sleep_logs_wake_time
+ON sleep_logs (wake_time);
+
+-- Lookups the reminder service runs every minute
+CREATE INDEX IF NOT EXISTS idx_pending_reminders_sent
+ON pending_reminders (sent, reminder_time);
+-- Partial index for the follow-up check: almost every old reminder has
+-- sent = 1, so only the ones still waiting on a follow-up are kept here
+CREATE INDEX IF NOT EXISTS idx_pending_reminders_followup
+ON pending_reminders (scheduled_time) WHERE sent = 1 AND followup_sent = 0;
+-- Logging a wake-up first clears the reminders created earlier today
+CREATE INDEX IF NOT EXISTS idx_pending_reminders_created_at
+ON pending_reminders (created_at);
+CREATE INDEX IF NOT EXISTS idx_wake_sleep_events_type
+ON wake_sleep_events (event_type, event_time);
+CREATE INDEX IF NOT EXISTS idx_medication_schedules_medication_id
+ON medication_schedules (medication_id, active);
+"""
+
+
+def init_database():
+    """
+    Create all the database tables if they don't exist.
+
+    This is safe to run multiple times - it won't delete existing data.
+    The 'IF NOT EXISTS' part of each CREATE TABLE ensures that.
+
+    Every command calls this, so once a database is set up for the current
+    SCHEMA_VERSION it just checks the version number (kept in SQLite's
+    built-in user_version header field) and returns.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # Already up to date? Then there's nothing to create or migrate.
+    cursor.execute("PRAGMA user_version")
+    if cursor.fetchone()[0] == SCHEMA_VERSION:
+        conn.close()
+        return
+
+    # Create all the tables and indexes with a single executescript() call.
+    # The script starts with BEGIN and executescript leaves that transaction
+    # open, so the migrations below join it and everything is saved by the
+    # one commit at the end. IMMEDIATE takes the write lock first, so if two
+    # programs start on an old database at once, the second waits and then
+    # sees the finished schema (rather than both adding the same column).
+    cursor.executescript("BEGIN IMMEDIATE;\n" + _SCHEMA_SQL)
 
     # ============================================================
     # MIGRATIONS - Add missing columns to existing tables
@@ -225,7 +546,10 @@ def init_database():
     # medication_schedules migrations
     add_column_if_missing('medication_schedules', 'reminders_enabled', 'INTEGER DEFAULT 1')
 
-    # Save all the changes
+    # Remember that this database is now up to date (saved with the commit below)
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # Save all the changes (in one go)
     conn.commit()
     conn.close()
 
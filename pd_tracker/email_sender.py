@@ -11,24 +11,34 @@ Configuration is done via environment variables:
 - PD_TRACKER_SMTP_PORT: SMTP port (default: 587)
 """
 
+import base64
 import os
 import smtplib
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
+from email.mime.application import MIMEApplication
 from email import encoders
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from .database import get_connection
+from .database import get_connection, get_read_connection, db_batch
 
 
 # ============================================================
 # CONFIGURATION
 # ============================================================
 
+@lru_cache(maxsize=1)
 def get_email_config() -> dict:
-    """Get email configuration from environment variables."""
+    """
+    Get email configuration from environment variables.
+
+    Cached: the environment doesn't change while the program runs, and
+    sending a report asks for the config several times. Callers should
+    treat the returned dict as read-only since it is shared.
+    """
     return {
         'email': os.environ.get('PD_TRACKER_EMAIL'),
         'password': os.environ.get('PD_TRACKER_EMAIL_PASSWORD'),
@@ -37,12 +47,24 @@ def get_email_config() -> dict:
     }
 
 
+@lru_cache(maxsize=1)
 def is_email_configured() -> bool:
-    """Check if email is configured."""
+    """Check if email is configured (cached, like get_email_config)."""
     config = get_email_config()
     return bool(config['email'] and config['password'])
 
 
+def reset_email_config():
+    """
+    Forget the cached email configuration.
+
+    Call this after changing the PD_TRACKER_* environment variables in a
+    running program (e.g. in a test) so the new values are picked up.
+    """
+    get_email_config.cache_clear()
+    is_email_configured.cache_clear()
+
+
 def get_missing_email_config() -> List[str]:
     """Return list of missing configuration items."""
     config = get_email_config()
@@ -86,6 +108,13 @@ def print_email_setup_instructions():
 # RECIPIENT MANAGEMENT
 # ============================================================
 
+# Adding an address that's already saved updates that row in place (and
+# re-activates it), so the recipient keeps its id. INSERT OR REPLACE would
+# delete the old row and insert a new one instead.
+_SQL_UPSERT_RECIPIENT = """INSERT INTO email_recipients (email, name, active)
+                           VALUES (?, ?, 1)
+                           ON CONFLICT(email) DO UPDATE SET name = excluded.name, active = 1"""
+
 def add_recipient(email: str, name: str = None) -> int:
     """
     Add an email recipient for reports.
@@ -100,21 +129,36 @@ def add_recipient(email: str, name: str = None) -> int:
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        "INSERT OR REPLACE INTO email_recipients (email, name, active) VALUES (?, ?, 1)",
-        (email, name)
-    )
+    cursor.execute(_SQL_UPSERT_RECIPIENT, (email, name))
 
-    recipient_id = cursor.lastrowid
+    # lastrowid isn't set when an existing row was updated, so look it up
+    cursor.execute("SELECT id FROM email_recipients WHERE email = ?", (email,))
+    recipient_id = cursor.fetchone()[0]
     conn.commit()
     conn.close()
 
     return recipient_id
 
 
+def add_recipients_bulk(recipients: List[tuple]) -> int:
+    """
+    Add several email recipients in one transaction.
+
+    Args:
+        recipients: List of (email, name) tuples (name may be None)
+
+    Returns:
+        Number of recipients added
+    """
+    with db_batch() as conn:
+        conn.executemany(_SQL_UPSERT_RECIPIENT, recipients)
+
+    return len(recipients)
+
+
 def get_recipients(active_only: bool = True) -> List[dict]:
     """Get all email recipients."""
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     if active_only:
@@ -128,6 +172,22 @@ def get_recipients(active_only: bool = True) -> List[dict]:
     return [dict(r) for r in rows]
 
 
+def get_recipient_emails() -> List[str]:
+    """
+    Get just the addresses of the active recipients.
+
+    Sending a report only needs the addresses, so this skips building a
+    dict for every recipient row.
+    """
+    conn = get_read_connection()
+    emails = [row[0] for row in conn.execute(
+        "SELECT email FROM email_recipients WHERE active = 1"
+    )]
+    conn.close()
+
+    return emails
+
+
 def remove_recipient(email: str) -> bool:
     """Remove (deactivate) a recipient."""
     conn = get_connection()
@@ -149,6 +209,83 @@ def remove_recipient(email: str) -> bool:
 # EMAIL SENDING
 # ============================================================
 
+# Attachments bigger than this are base64-encoded a piece at a time
+LARGE_ATTACHMENT_BYTES = 5 * 1024 * 1024
+
+# Read size for large attachments. A multiple of 57 bytes, because base64
+# turns every 57 bytes into one full 76-character line, so the encoded
+# pieces join up exactly.
+_ATTACHMENT_CHUNK_BYTES = 57 * 16384
+
+
+def _attachment_part(filepath: Path) -> Optional[MIMEApplication]:
+    """
+    Build the attachment part for one file.
+
+    Small files are read in one go and MIMEApplication base64-encodes them.
+    Large exports are encoded chunk by chunk, so we never hold the whole
+    raw file and its encoded copy in memory at the same time.
+
+    Args:
+        filepath: File to attach
+
+    Returns:
+        The MIME part, or None if the file doesn't exist
+    """
+    try:
+        f = open(filepath, 'rb')
+    except FileNotFoundError:
+        return None
+
+    with f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size <= LARGE_ATTACHMENT_BYTES:
+            part = MIMEApplication(f.read(), Name=filepath.name)
+        else:
+            chunks = []
+            while True:
+                chunk = f.read(_ATTACHMENT_CHUNK_BYTES)
+                if not chunk:
+                    break
+                chunks.append(base64.encodebytes(chunk).decode('ascii'))
+
+            # Payload is already encoded, so tell MIMEApplication not to redo it
+            part = MIMEApplication(
+                ''.join(chunks), _encoder=encoders.encode_noop, Name=filepath.name
+            )
+            part['Content-Transfer-Encoding'] = 'base64'
+
+    part.add_header('Content-Disposition', f'attachment; filename="{filepath.name}"')
+    return part
+
+
+def _build_message(
+    sender: str,
+    to_addresses: List[str],
+    subject: str,
+    body: str,
+    attachments: List[Path] = None,
+) -> MIMEMultipart:
+    """Build one email message with its body and file attachments."""
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = ', '.join(to_addresses)
+    msg['Subject'] = subject
+
+    # Attach body
+    msg.attach(MIMEText(body, 'plain'))
+
+    # Attach files (missing files are skipped)
+    if attachments:
+        for filepath in attachments:
+            part = _attachment_part(Path(filepath))
+            if part is not None:
+                msg.attach(part)
+
+    return msg
+
+
 def send_email(
     to_addresses: List[str],
     subject: str,
@@ -164,6 +301,123 @@ def send_email(
         body: Email body (plain text)
         attachments: List of file paths to attach
 
+    Returns:
+        Dict with 'success' and either 'message' or 'error'
+    """
+    result = send_emails_bulk([{
+        'to': to_addresses,
+        'subject': subject,
+        'body': body,
+        'attachments': attachments,
+    }])
+
+    if result['success']:
+        result['message'] = f'Email sent to {len(to_addresses)} recipient(s)'
+    return result
+
+
+# Give up on an SMTP server that stops answering after this many seconds,
+# instead of hanging forever
+SMTP_TIMEOUT_SECONDS = 30
+
+
+def _connect_smtp() -> smtplib.SMTP:
+    """Open a connection to the SMTP server, start TLS and log in."""
+    config = get_email_config()
+    server = smtplib.SMTP(config['smtp_host'], config['smtp_port'],
+                          timeout=SMTP_TIMEOUT_SECONDS)
+    server.starttls()
+    server.login(config['email'], config['password'])
+    return server
+
+
+def connect_smtp_in_background() -> Future:
+    """
+    Start connecting to the SMTP server on a background thread.
+
+    Connecting, starting TLS and logging in is mostly waiting on the
+    network. Code that is about to build a report and then email it can
+    call this first, so the login happens while the report is being built,
+    and then pass the result to send_report_email(session=...).
+
+    Always finish with close_smtp_session(), in a finally block, so the
+    connection is logged out even if building the report fails.
+
+    Returns:
+        A Future that gives the logged-in smtplib.SMTP connection
+    """
+    pool = ThreadPoolExecutor(max_workers=1)
+    future = pool.submit(_connect_smtp)
+    pool.shutdown(wait=False)  # the thread ends once the login is done
+    return future
+
+
+def _quit_smtp_future(future: Future):
+    """Log out of the connection a finished connect_smtp_in_background() gave."""
+    try:
+        server = future.result()
+    except Exception:
+        return  # it never connected, so there's nothing to close
+
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        # Already closed (send_emails_bulk() does that when it's done) or
+        # the server hung up
+        server.close()
+
+
+def close_smtp_session(session: Optional[Future]):
+    """
+    Clean up a connection started with connect_smtp_in_background().
+
+    Safe to call whether or not the connection was used to send anything.
+    If the login is still in progress, it's stopped if it hasn't started
+    yet, or logged out as soon as it finishes.
+
+    Args:
+        session: The Future from connect_smtp_in_background(), or None
+    """
+    if session is None or session.cancel():
+        return
+    session.add_done_callback(_quit_smtp_future)
+
+
+def _get_smtp_session(session: Optional[Future]) -> smtplib.SMTP:
+    """
+    Use the connection from connect_smtp_in_background() if it's still
+    good, otherwise open a new one.
+    """
+    if session is not None:
+        try:
+            server = session.result()
+        except Exception:
+            # Connecting again below raises the same error, handled as usual
+            server = None
+
+        if server is not None:
+            try:
+                # The server may have hung up while the report was built
+                server.noop()
+                return server
+            except (smtplib.SMTPException, OSError):
+                server.close()
+
+    return _connect_smtp()
+
+
+def send_emails_bulk(messages: List[dict], session: Future = None) -> dict:
+    """
+    Send several emails over a single SMTP connection.
+
+    Connecting, starting TLS and logging in take far longer than sending
+    a message, so this is done once and every message reuses the session.
+
+    Args:
+        messages: List of dicts with 'to' (list of addresses), 'subject',
+                  'body' and optionally 'attachments' (list of file paths)
+        session: Optional connection started with connect_smtp_in_background()
+
     Returns:
         Dict with 'success' and either 'message' or 'error'
     """
@@ -176,39 +430,23 @@ def send_email(
     config = get_email_config()
 
     try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = config['email']
-        msg['To'] = ', '.join(to_addresses)
-        msg['Subject'] = subject
-
-        # Attach body
-        msg.attach(MIMEText(body, 'plain'))
-
-        # Attach files
-        if attachments:
-            for filepath in attachments:
-                filepath = Path(filepath)
-                if filepath.exists():
-                    with open(filepath, 'rb') as f:
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(f.read())
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename="{filepath.name}"'
-                    )
-                    msg.attach(part)
-
-        # Send email
-        with smtplib.SMTP(config['smtp_host'], config['smtp_port']) as server:
-            server.starttls()
-            server.login(config['email'], config['password'])
-            server.send_message(msg)
+        # Build every message first, so a bad attachment fails before we connect
+        mime_messages = [
+            _build_message(
+                config['email'], m['to'], m['subject'], m['body'],
+                m.get('attachments'),
+            )
+            for m in messages
+        ]
+
+        # Send them all in one session
+        with _get_smtp_session(session) as server:
+            for msg in mime_messages:
+                server.send_message(msg)
 
         return {
             'success': True,
-            'message': f'Email sent to {len(to_addresses)} recipient(s)'
+            'message': f'Sent {len(mime_messages)} email(s)'
         }
 
     except smtplib.SMTPAuthenticationError:
@@ -224,50 +462,71 @@ def send_email(
 
 
 def send_report_email(
-    report_path: Path,
+    report_path: Union[Path, List[Path]],
     to_addresses: List[str] = None,
     subject: str = None,
+    session: Future = None,
 ) -> dict:
     """
     Send a report file via email.
 
+    Several reports can be passed as a list; each goes out as its own
+    email, but all of them are sent over one SMTP connection.
+
     Args:
-        report_path: Path to the report file
+        report_path: Path to the report file, or a list of paths
         to_addresses: List of recipients (uses saved recipients if None)
         subject: Custom subject (auto-generated if None)
+        session: Optional connection started with connect_smtp_in_background()
 
     Returns:
         Dict with 'success' and either 'message' or 'error'
     """
     # Get recipients
     if to_addresses is None:
-        recipients = get_recipients()
-        if not recipients:
+        to_addresses = get_recipient_emails()
+        if not to_addresses:
             return {
                 'success': False,
                 'error': 'No email recipients configured. Use "pd report add-email" first.'
             }
-        to_addresses = [r['email'] for r in recipients]
 
     # Generate subject
     if subject is None:
         from datetime import datetime
         subject = f"PD Tracker Report - {datetime.now().strftime('%Y-%m-%d')}"
 
-    # Generate body
-    body = f"""
+    report_paths = report_path if isinstance(report_path, list) else [report_path]
+
+    messages = []
+    for path in report_paths:
+        path = Path(path)
+
+        # Generate body
+        body = f"""
 PD Tracker Report
 
 Please find your health tracking report attached.
 
-Report file: {report_path.name}
-Generated: {Path(report_path).stat().st_mtime if report_path.exists() else 'N/A'}
+Report file: {path.name}
+Generated: {path.stat().st_mtime if path.exists() else 'N/A'}
 
 ---
 This report was automatically generated by PD Tracker.
 """
 
-    return send_email(to_addresses, subject, body, [report_path])
+        messages.append({
+            'to': to_addresses,
+            'subject': subject,
+            'body': body,
+            'attachments': [path],
+        })
+
+    result = send_emails_bulk(messages, session)
+
+    if result['success']:
+        result['message'] = f'Email sent to {len(to_addresses)} recipient(s)'
+    return result
 
 
 def send_test_email() -> dict:
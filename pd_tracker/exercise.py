@@ -12,9 +12,12 @@ Exercise is particularly important for PD management as it can
 help with symptoms and overall quality of life.
 """
 
+import json
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 from typing import Optional
-from .database import get_connection
+from .database import get_connection, get_read_connection, db_batch
+from .formatting import fmt_clock, fmt_day
 
 
 # Common exercise types for quick selection
@@ -34,9 +37,26 @@ COMMON_EXERCISES = [
     'Other',
 ]
 
+# The numbered list shown by 'pd exercise log', built once at import
+# since COMMON_EXERCISES never changes
+COMMON_EXERCISES_MENU = "\n".join(
+    f"  {i:2}. {ex}" for i, ex in enumerate(COMMON_EXERCISES, 1)
+)
+
 # Intensity levels
 INTENSITY_LEVELS = ['light', 'moderate', 'vigorous']
 
+# SQL shared by more than one function, written once here so the copies
+# can't drift apart: the INSERT is used by log_exercise() and
+# log_exercises_bulk(), the SELECT by get_exercise_today() and
+# get_exercise_logs()
+_SQL_INSERT_EXERCISE = """INSERT INTO exercise_logs
+                          (exercise_type, start_time, duration_minutes, intensity, notes)
+                          VALUES (?, ?, ?, ?, ?)"""
+_SQL_SELECT_EXERCISE_SINCE = """SELECT * FROM exercise_logs
+                                WHERE start_time >= ?
+                                ORDER BY start_time DESC"""
+
 
 def log_exercise(
     exercise_type: str,
@@ -71,9 +91,7 @@ def log_exercise(
     cursor = conn.cursor()
 
     cursor.execute(
-        """INSERT INTO exercise_logs
-           (exercise_type, start_time, duration_minutes, intensity, notes)
-           VALUES (?, ?, ?, ?, ?)""",
+        _SQL_INSERT_EXERCISE,
         (exercise_type, start_time, duration_minutes, intensity, notes)
     )
 
@@ -84,6 +102,34 @@ def log_exercise(
     return exercise_id
 
 
+def log_exercises_bulk(records: list) -> int:
+    """
+    Log many exercise sessions at once (e.g. when importing old data).
+
+    All rows go in with executemany inside a single transaction, so the
+    whole import costs one disk sync instead of one per session.
+
+    Args:
+        records: List of (exercise_type, start_time, duration_minutes,
+                 intensity, notes) tuples. Intensity is normalized the same
+                 way log_exercise does it.
+
+    Returns:
+        Number of exercise records added
+    """
+    rows = []
+    for exercise_type, start_time, duration_minutes, intensity, notes in records:
+        intensity = (intensity or 'moderate').lower()
+        if intensity not in INTENSITY_LEVELS:
+            intensity = 'moderate'
+        rows.append((exercise_type, start_time, duration_minutes, intensity, notes))
+
+    with db_batch() as conn:
+        conn.executemany(_SQL_INSERT_EXERCISE, rows)
+
+    return len(rows)
+
+
 def get_exercise_today() -> list:
     """
     Get all exercise logged today.
@@ -91,17 +137,12 @@ def get_exercise_today() -> list:
     Returns:
         List of exercise records, most recent first
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     today_start = datetime.combine(date.today(), datetime.min.time())
 
-    cursor.execute(
-        """SELECT * FROM exercise_logs
-           WHERE start_time >= ?
-           ORDER BY start_time DESC""",
-        (today_start,)
-    )
+    cursor.execute(_SQL_SELECT_EXERCISE_SINCE, (today_start,))
 
     records = cursor.fetchall()
     conn.close()
@@ -119,17 +160,12 @@ def get_exercise_logs(days: int = 7) -> list:
     Returns:
         List of exercise records, most recent first
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     start_date = datetime.now() - timedelta(days=days)
 
-    cursor.execute(
-        """SELECT * FROM exercise_logs
-           WHERE start_time >= ?
-           ORDER BY start_time DESC""",
-        (start_date,)
-    )
+    cursor.execute(_SQL_SELECT_EXERCISE_SINCE, (start_date,))
 
     records = cursor.fetchall()
     conn.close()
@@ -148,7 +184,7 @@ def get_exercise_range(start_date: date, end_date: date) -> list:
     Returns:
         List of exercise records within the range, most recent first
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     start_dt = datetime.combine(start_date, datetime.min.time())
@@ -177,7 +213,7 @@ def get_exercise_by_id(exercise_id: int) -> Optional[dict]:
     Returns:
         The exercise record, or None if not found
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     cursor.execute("SELECT * FROM exercise_logs WHERE id = ?", (exercise_id,))
@@ -273,9 +309,30 @@ def get_exercise_stats(days: int = 7) -> dict:
     Returns:
         Dict with total_minutes, total_sessions, avg_per_day, by_type
     """
-    logs = get_exercise_logs(days)
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    start_date = datetime.now() - timedelta(days=days)
+
+    # Let SQL do the grouping in a single pass over the range: one small
+    # row per (type, intensity) pair instead of one per session. Sessions
+    # without an intensity count as moderate. Most recent groups come
+    # first, so by_type lists the most recently done types first.
+    cursor.execute(
+        """SELECT exercise_type,
+                  COALESCE(intensity, 'moderate') AS intensity,
+                  COUNT(*) AS sessions,
+                  COALESCE(SUM(duration_minutes), 0) AS minutes
+           FROM exercise_logs
+           WHERE start_time >= ?
+           GROUP BY 1, 2
+           ORDER BY MAX(start_time) DESC""",
+        (start_date,)
+    )
+    groups = cursor.fetchall()
+    conn.close()
 
-    if not logs:
+    if not groups:
         return {
             'total_minutes': 0,
             'total_sessions': 0,
@@ -284,27 +341,23 @@ def get_exercise_stats(days: int = 7) -> dict:
             'by_intensity': {'light': 0, 'moderate': 0, 'vigorous': 0},
         }
 
-    total_minutes = sum(l['duration_minutes'] for l in logs)
-
-    # Group by type
+    # Fold the few group rows into per-type and per-intensity totals
     by_type = {}
-    for log in logs:
-        etype = log['exercise_type']
-        if etype not in by_type:
-            by_type[etype] = {'sessions': 0, 'minutes': 0}
-        by_type[etype]['sessions'] += 1
-        by_type[etype]['minutes'] += log['duration_minutes']
-
-    # Group by intensity
     by_intensity = {'light': 0, 'moderate': 0, 'vigorous': 0}
-    for log in logs:
-        intensity = log['intensity'] or 'moderate'
-        if intensity in by_intensity:
-            by_intensity[intensity] += log['duration_minutes']
+    for row in groups:
+        totals = by_type.setdefault(row['exercise_type'], {'sessions': 0, 'minutes': 0})
+        totals['sessions'] += row['sessions']
+        totals['minutes'] += row['minutes']
+        if row['intensity'] in by_intensity:
+            by_intensity[row['intensity']] += row['minutes']
+
+    # Totals come straight from the per-type groups
+    total_minutes = sum(t['minutes'] for t in by_type.values())
+    total_sessions = sum(t['sessions'] for t in by_type.values())
 
     return {
         'total_minutes': total_minutes,
-        'total_sessions': len(logs),
+        'total_sessions': total_sessions,
         'avg_minutes_per_day': round(total_minutes / days, 1),
         'by_type': by_type,
         'by_intensity': by_intensity,
@@ -318,15 +371,73 @@ def get_today_stats() -> dict:
     Returns:
         Dict with total_minutes, sessions, types
     """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    today_start = datetime.combine(date.today(), datetime.min.time())
+
+    # Only the totals are needed here, so let SQLite add them up rather
+    # than loading every session. json_group_array gives back the distinct
+    # types as a JSON list (safe even if a custom type contains a comma).
+    cursor.execute(
+        """SELECT COUNT(*) AS sessions,
+                  COALESCE(SUM(duration_minutes), 0) AS total_minutes,
+                  json_group_array(DISTINCT exercise_type) AS types
+           FROM exercise_logs
+           WHERE start_time >= ?""",
+        (today_start,)
+    )
+    row = cursor.fetchone()
+    conn.close()
+
+    return {
+        'total_minutes': row['total_minutes'],
+        'sessions': row['sessions'],
+        'types': json.loads(row['types']),
+    }
+
+
+def get_exercise_today_with_stats() -> dict:
+    """
+    Get today's exercise sessions and their stats from a single query.
+
+    Use this instead of calling get_today_stats() and get_exercise_today()
+    back to back - both read the same rows.
+
+    Returns:
+        Same dict as get_today_stats(), plus 'logs' (today's exercise
+        records, most recent first)
+    """
     logs = get_exercise_today()
 
-    total_minutes = sum(l['duration_minutes'] for l in logs)
-    types = list(set(l['exercise_type'] for l in logs))
+    stats = summarize_exercise_today(logs)
+    stats['logs'] = logs
+    return stats
+
+
+def summarize_exercise_today(logs: list) -> dict:
+    """
+    Work out today's exercise stats from already-loaded exercise records.
+
+    Args:
+        logs: Exercise records (e.g. from get_exercise_today())
+
+    Returns:
+        Dict with total_minutes, sessions, types (each type listed once,
+        in the order the records came in)
+    """
+    total_minutes = 0
+    types = {}  # used as an ordered set - dict keys keep insertion order
+
+    # One pass over the records for both the total and the types
+    for l in logs:
+        total_minutes += l['duration_minutes']
+        types[l['exercise_type']] = None
 
     return {
         'total_minutes': total_minutes,
         'sessions': len(logs),
-        'types': types,
+        'types': list(types),
     }
 
 
@@ -342,8 +453,8 @@ def format_exercise_entry(log: dict) -> str:
     """
     lines = []
 
-    start_time = datetime.fromisoformat(log['start_time'])
-    lines.append(f"  {start_time.strftime('%a, %b %d')} at {start_time.strftime('%I:%M %p').lstrip('0')}")
+    start_time = log['start_time']
+    lines.append(f"  {fmt_day(start_time)} at {fmt_clock(start_time)}")
     lines.append(f"    Type: {log['exercise_type']}")
     lines.append(f"    Duration: {log['duration_minutes']} minutes")
     lines.append(f"    Intensity: {log['intensity'].capitalize()}")
@@ -354,10 +465,14 @@ def format_exercise_entry(log: dict) -> str:
     return '\n'.join(lines)
 
 
+@lru_cache(maxsize=4096)
 def format_duration_friendly(minutes: int) -> str:
     """
     Format minutes into a friendly string.
 
+    Cached: sessions tend to repeat the same few lengths (15, 30, 45...),
+    so most calls are answered from the cache.
+
     Args:
         minutes: Duration in minutes
 
@@ -365,8 +480,7 @@ def format_duration_friendly(minutes: int) -> str:
         String like "1h 30m" or "45m"
     """
     if minutes >= 60:
-        hours = minutes // 60
-        mins = minutes % 60
+        hours, mins = divmod(minutes, 60)
         if mins > 0:
             return f"{hours}h {mins}m"
         return f"{hours}h"
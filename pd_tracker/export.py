@@ -13,28 +13,24 @@ Supports exporting:
 import csv
 import io
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-
-from .database import get_connection
+# openpyxl and reportlab are imported inside export_excel and export_pdf
+# instead of up here. They take a noticeable moment to load, and CSV
+# exports (and anything else that imports this module) don't need them.
+
+from .database import get_read_connection
 from .models import get_medication_status_today, get_all_medications
-from .symptoms import get_symptoms_range
-from .sleep import get_sleep_logs, get_sleep_stats, get_sleep_range
-from .exercise import get_exercise_logs, get_exercise_stats, get_exercise_range
+from .sleep import get_sleep_logs, get_sleep_stats
+from .exercise import get_exercise_logs, get_exercise_stats
 
 
 # Default export directory
-EXPORT_DIR = Path(__file__).parent.parent / "exports"
+# Defined in config so commands that only need the folder (like backups)
+# don't have to import this module and its openpyxl/reportlab dependencies
+from .config import EXPORT_DIR
 
 
 def ensure_export_dir():
@@ -47,21 +43,47 @@ def ensure_export_dir():
 # DATA RETRIEVAL
 # ============================================================
 
-def get_medication_history(start_date: date, end_date: date) -> list:
-    """Get medication dose history for date range."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
-
-    cursor.execute("""
+# One query per kind of data in a report. Each takes the start and end
+# of the range (end exclusive) and returns the newest rows first.
+_SQL_EXPORT_QUERIES = {
+    'medications': """
         SELECT d.*, m.name as medication_name, m.dosage
         FROM doses_taken d
         JOIN medications m ON d.medication_id = m.id
         WHERE d.taken_time >= ? AND d.taken_time < ?
         ORDER BY d.taken_time DESC
-    """, (start_dt, end_dt))
+    """,
+    'symptoms': """
+        SELECT * FROM symptoms
+        WHERE timestamp >= ? AND timestamp < ?
+        ORDER BY timestamp DESC
+    """,
+    'sleep': """
+        SELECT * FROM sleep_logs
+        WHERE sleep_time >= ? AND sleep_time < ?
+        ORDER BY sleep_time DESC
+    """,
+    'exercise': """
+        SELECT * FROM exercise_logs
+        WHERE start_time >= ? AND start_time < ?
+        ORDER BY start_time DESC
+    """,
+}
+
+
+def _range_bounds(start_date: date, end_date: date) -> tuple:
+    """Turn an inclusive date range into (start, end) datetimes, end exclusive."""
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+    return start_dt, end_dt
+
+
+def get_medication_history(start_date: date, end_date: date) -> list:
+    """Get medication dose history for date range."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(_SQL_EXPORT_QUERIES['medications'], _range_bounds(start_date, end_date))
 
     rows = cursor.fetchall()
     conn.close()
@@ -69,12 +91,105 @@ def get_medication_history(start_date: date, end_date: date) -> list:
 
 
 def get_all_data(start_date: date, end_date: date) -> dict:
-    """Get all tracking data for a date range."""
+    """
+    Get all tracking data for a date range.
+
+    All four queries run on one cursor inside a single read transaction,
+    so the report sees one consistent snapshot of the database even if
+    something is logged while it's being built.
+
+    Returns:
+        Dict with 'medications', 'symptoms', 'sleep' and 'exercise' lists
+    """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    bounds = _range_bounds(start_date, end_date)
+
+    data = {}
+    cursor.execute("BEGIN")
+    try:
+        for name, sql in _SQL_EXPORT_QUERIES.items():
+            cursor.execute(sql, bounds)
+            data[name] = [dict(r) for r in cursor]
+    finally:
+        cursor.execute("COMMIT")
+    conn.close()
+
+    return data
+
+
+def get_report_summary(start_date: date, end_date: date) -> dict:
+    """
+    Get the totals shown in the PDF report for a date range.
+
+    The PDF only shows counts and averages, so SQLite works them out with
+    COUNT/SUM/AVG instead of every row being loaded into Python first.
+    Like get_all_data(), everything is read in one read transaction.
+
+    Returns:
+        Dict with:
+            'medications', 'symptoms', 'sleep', 'exercise': number of entries
+            'doses_by_medication': list of (name, doses) sorted by name
+            'symptom_states': dict of on_off_state -> count
+            'sleep_nights': sleep logs with a wake time
+            'sleep_avg_quality': average quality (None if none rated)
+            'exercise_minutes': total minutes of exercise
+    """
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    bounds = _range_bounds(start_date, end_date)
+
+    cursor.execute("BEGIN")
+    try:
+        cursor.execute(
+            """SELECT m.name, COUNT(*)
+               FROM doses_taken d
+               JOIN medications m ON d.medication_id = m.id
+               WHERE d.taken_time >= ? AND d.taken_time < ?
+               GROUP BY m.name
+               ORDER BY m.name""",
+            bounds
+        )
+        doses_by_medication = cursor.fetchall()
+
+        cursor.execute(
+            """SELECT on_off_state, COUNT(*) FROM symptoms
+               WHERE timestamp >= ? AND timestamp < ?
+               GROUP BY on_off_state""",
+            bounds
+        )
+        symptom_states = dict(cursor.fetchall())
+
+        # A quality of 0 means "not rated", so NULLIF leaves it out of AVG
+        cursor.execute(
+            """SELECT COUNT(*), COUNT(wake_time), AVG(NULLIF(quality, 0))
+               FROM sleep_logs
+               WHERE sleep_time >= ? AND sleep_time < ?""",
+            bounds
+        )
+        sleep_logs, sleep_nights, sleep_avg_quality = cursor.fetchone()
+
+        cursor.execute(
+            """SELECT COUNT(*), COALESCE(SUM(duration_minutes), 0)
+               FROM exercise_logs
+               WHERE start_time >= ? AND start_time < ?""",
+            bounds
+        )
+        exercise_sessions, exercise_minutes = cursor.fetchone()
+    finally:
+        cursor.execute("COMMIT")
+    conn.close()
+
     return {
-        'medications': get_medication_history(start_date, end_date),
-        'symptoms': [dict(s) for s in get_symptoms_range(start_date, end_date)],
-        'sleep': [dict(s) for s in get_sleep_range(start_date, end_date)],
-        'exercise': [dict(e) for e in get_exercise_range(start_date, end_date)],
+        'medications': sum(count for _, count in doses_by_medication),
+        'symptoms': sum(symptom_states.values()),
+        'sleep': sleep_logs,
+        'exercise': exercise_sessions,
+        'doses_by_medication': [tuple(r) for r in doses_by_medication],
+        'symptom_states': symptom_states,
+        'sleep_nights': sleep_nights,
+        'sleep_avg_quality': sleep_avg_quality,
+        'exercise_minutes': exercise_minutes,
     }
 
 
@@ -82,8 +197,85 @@ def get_all_data(start_date: date, end_date: date) -> dict:
 # CSV EXPORT
 # ============================================================
 
+# Write buffer for CSV files
+CSV_BUFFER_BYTES = 1024 * 1024
+
+
+def _write_query_csv(cursor, sql: str, bounds: tuple, filepath: Path) -> bool:
+    """
+    Run one export query and write its rows straight into a CSV file.
+
+    The rows go from the cursor to the file one at a time, so even a long
+    date range never has to fit in memory as a list of dicts. The column
+    names come from the query itself (cursor.description).
+
+    Args:
+        cursor: Cursor to run the query on
+        sql: One of the _SQL_EXPORT_QUERIES
+        bounds: (start, end) from _range_bounds()
+        filepath: Where to write the CSV
+
+    Returns:
+        True if the file was written, False if the query found no rows
+        (no file is created then)
+    """
+    cursor.execute(sql, bounds)
+    first = cursor.fetchone()
+    if first is None:
+        return False
+
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_BYTES) as f:
+        writer = csv.writer(f)
+        writer.writerow(col[0] for col in cursor.description)
+        writer.writerow(first)
+        writer.writerows(cursor)
+
+    return True
+
+
+def _stream_csv(data_type: str, start_date: date, end_date: date, filepath: Path) -> Path:
+    """
+    export_csv() for when the data hasn't been loaded yet.
+
+    Everything is read in one read transaction, like get_all_data(), but
+    each query's rows are written out as they're fetched.
+    """
+    if data_type == 'all':
+        targets = [
+            (dtype, EXPORT_DIR / f"pd_tracker_{dtype}_{start_date}_{end_date}.csv")
+            for dtype in _SQL_EXPORT_QUERIES
+        ]
+    else:
+        targets = [(data_type, filepath)]
+
+    conn = get_read_connection()
+    cursor = conn.cursor()
+    bounds = _range_bounds(start_date, end_date)
+
+    files = []
+    cursor.execute("BEGIN")
+    try:
+        for dtype, path in targets:
+            sql = _SQL_EXPORT_QUERIES.get(dtype)
+            if sql and _write_query_csv(cursor, sql, bounds, path):
+                files.append(path)
+    finally:
+        cursor.execute("COMMIT")
+    conn.close()
+
+    if data_type == 'all':
+        return files[0].parent if files else EXPORT_DIR
+
+    if not files:
+        # Create a file that just says there was nothing to export
+        with open(filepath, 'w', newline='') as f:
+            f.write(f"No {data_type} data for this period\n")
+
+    return filepath
+
+
 def export_csv(data_type: str, start_date: date, end_date: date,
-               filename: str = None) -> Path:
+               filename: str = None, all_data: dict = None) -> Path:
     """
     Export data to CSV file.
 
@@ -92,6 +284,8 @@ def export_csv(data_type: str, start_date: date, end_date: date,
         start_date: Start of date range
         end_date: End of date range
         filename: Optional custom filename
+        all_data: Data from get_all_data() for this range, if you already
+                  have it (e.g. when exporting several formats at once)
 
     Returns:
         Path to the created CSV file
@@ -102,14 +296,17 @@ def export_csv(data_type: str, start_date: date, end_date: date,
         filename = f"pd_tracker_{data_type}_{start_date}_{end_date}.csv"
 
     filepath = EXPORT_DIR / filename
-    all_data = get_all_data(start_date, end_date)
+    if all_data is None:
+        # Nothing loaded yet - stream the rows from SQLite into the file(s)
+        return _stream_csv(data_type, start_date, end_date, filepath)
 
     if data_type == 'all':
-        # For 'all', create multiple CSVs
+        # For 'all', create multiple CSVs - from the data we already
+        # loaded, rather than querying the database again for each one
         files = []
         for dtype in ['medications', 'symptoms', 'sleep', 'exercise']:
             if all_data[dtype]:
-                f = export_csv(dtype, start_date, end_date)
+                f = export_csv(dtype, start_date, end_date, all_data=all_data)
                 files.append(f)
         return files[0].parent if files else EXPORT_DIR
 
@@ -121,11 +318,15 @@ def export_csv(data_type: str, start_date: date, end_date: date,
             f.write(f"No {data_type} data for this period\n")
         return filepath
 
-    # Write CSV
-    with open(filepath, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=data[0].keys())
-        writer.writeheader()
-        writer.writerows(data)
+    # Write CSV. A 1 MiB buffer means the rows reach the disk in a few
+    # large writes instead of many small ones. Every row comes from the same
+    # query with the same columns in the same order, so a plain csv.writer
+    # can take the values directly - DictWriter would check and look up
+    # each key of every row.
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_BYTES) as f:
+        writer = csv.writer(f)
+        writer.writerow(data[0].keys())
+        writer.writerows(row.values() for row in data)
 
     return filepath
 
@@ -134,7 +335,8 @@ def export_csv(data_type: str, start_date: date, end_date: date,
 # EXCEL EXPORT
 # ============================================================
 
-def export_excel(start_date: date, end_date: date, filename: str = None) -> Path:
+def export_excel(start_date: date, end_date: date, filename: str = None,
+                 all_data: dict = None) -> Path:
     """
     Export all data to Excel file with multiple sheets.
 
@@ -142,95 +344,98 @@ def export_excel(start_date: date, end_date: date, filename: str = None) -> Path
         start_date: Start of date range
         end_date: End of date range
         filename: Optional custom filename
+        all_data: Data from get_all_data() for this range, if you already
+                  have it (e.g. when exporting several formats at once)
 
     Returns:
         Path to the created Excel file
     """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+    from openpyxl.utils import get_column_letter
+
     ensure_export_dir()
 
     if filename is None:
         filename = f"pd_tracker_report_{start_date}_{end_date}.xlsx"
 
     filepath = EXPORT_DIR / filename
-    all_data = get_all_data(start_date, end_date)
-
-    # Create workbook
-    wb = Workbook()
-
-    # Style definitions
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
+    if all_data is None:
+        all_data = get_all_data(start_date, end_date)
+
+    # Create workbook. write_only streams each row straight into the file
+    # instead of keeping a cell object for every value, which makes big
+    # exports much faster and lighter. The catch: a row can't be changed
+    # after it's appended, so all styling is decided up front.
+    wb = Workbook(write_only=True)
+
+    # Style definitions, registered once as named styles. A cell then
+    # just refers to the style by name instead of getting its font, fill,
+    # alignment and border set one by one.
+    header_style = NamedStyle(
+        name="pd_header",
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        alignment=Alignment(horizontal='center'),
+        border=Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        ),
     )
+    title_style = NamedStyle(name="pd_title", font=Font(bold=True, size=16))
+    wb.add_named_style(title_style)
+
+    # Nothing logged in the period? Then only the Summary sheet is written
+    # and the header style is never needed.
+    has_data = any(all_data.values())
+    if has_data:
+        wb.add_named_style(header_style)
+
+    def write_sheet(title, rows):
+        """Add a sheet with a styled header row followed by the data rows."""
+        ws = wb.create_sheet(title)
+        headers = list(rows[0].keys())
+
+        # Column widths must be set before the first row is written, so
+        # they're worked out from the row dicts rather than the sheet.
+        # Widths are capped at 50, so a column can stop looking as soon as
+        # one value is long enough (a long note usually ends it early).
+        for col_num, header in enumerate(headers, 1):
+            width = len(header)
+            for row in rows:
+                value = row[header]
+                if value is not None:
+                    # Text (the long columns) is measured as-is; only numbers
+                    # and dates need converting first
+                    length = len(value) if isinstance(value, str) else len(str(value))
+                    if length > width:
+                        width = length
+                        if width >= 48:
+                            break
+            ws.column_dimensions[get_column_letter(col_num)].width = min(width + 2, 50)
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = "pd_header"
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        for row in rows:
+            ws.append(list(row.values()))
+
+    # Summary sheet (first, since write-only sheets are kept in the order
+    # they're created)
+    ws = wb.create_sheet("Summary")
+    ws.column_dimensions['A'].width = 30
+    ws.column_dimensions['B'].width = 20
 
-    def style_sheet(ws, df):
-        """Apply styling to a worksheet."""
-        # Header styling
-        for col_num, cell in enumerate(ws[1], 1):
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = border
-
-        # Data styling
-        for row in ws.iter_rows(min_row=2):
-            for cell in row:
-                cell.border = border
-
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-
-    # Remove default sheet
-    wb.remove(wb.active)
-
-    # Medications sheet
-    if all_data['medications']:
-        ws = wb.create_sheet("Medications")
-        df = pd.DataFrame(all_data['medications'])
-        for r in dataframe_to_rows(df, index=False, header=True):
-            ws.append(r)
-        style_sheet(ws, df)
-
-    # Symptoms sheet
-    if all_data['symptoms']:
-        ws = wb.create_sheet("Symptoms")
-        df = pd.DataFrame(all_data['symptoms'])
-        for r in dataframe_to_rows(df, index=False, header=True):
-            ws.append(r)
-        style_sheet(ws, df)
-
-    # Sleep sheet
-    if all_data['sleep']:
-        ws = wb.create_sheet("Sleep")
-        df = pd.DataFrame(all_data['sleep'])
-        for r in dataframe_to_rows(df, index=False, header=True):
-            ws.append(r)
-        style_sheet(ws, df)
-
-    # Exercise sheet
-    if all_data['exercise']:
-        ws = wb.create_sheet("Exercise")
-        df = pd.DataFrame(all_data['exercise'])
-        for r in dataframe_to_rows(df, index=False, header=True):
-            ws.append(r)
-        style_sheet(ws, df)
-
-    # Summary sheet
-    ws = wb.create_sheet("Summary", 0)
-    ws.append(["PD Tracker Report"])
+    title = WriteOnlyCell(ws, value="PD Tracker Report")
+    title.style = "pd_title"
+    ws.append([title])
     ws.append([f"Period: {start_date} to {end_date}"])
     ws.append([f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"])
     ws.append([])
@@ -240,10 +445,23 @@ def export_excel(start_date: date, end_date: date, filename: str = None) -> Path
     ws.append(["Sleep logs:", len(all_data['sleep'])])
     ws.append(["Exercise sessions:", len(all_data['exercise'])])
 
-    # Style summary
-    ws['A1'].font = Font(bold=True, size=16)
-    ws.column_dimensions['A'].width = 30
-    ws.column_dimensions['B'].width = 20
+    if not has_data:
+        ws.append([])
+        ws.append(["No data was logged in this period."])
+        wb.save(filepath)
+        return filepath
+
+    # One sheet per kind of data that has any entries. They're written one
+    # after another on purpose: openpyxl workbooks aren't thread-safe, and
+    # the per-row work is plain Python, which threads can't run in parallel.
+    if all_data['medications']:
+        write_sheet("Medications", all_data['medications'])
+    if all_data['symptoms']:
+        write_sheet("Symptoms", all_data['symptoms'])
+    if all_data['sleep']:
+        write_sheet("Sleep", all_data['sleep'])
+    if all_data['exercise']:
+        write_sheet("Exercise", all_data['exercise'])
 
     wb.save(filepath)
     return filepath
@@ -253,10 +471,61 @@ def export_excel(start_date: date, end_date: date, filename: str = None) -> Path
 # PDF EXPORT
 # ============================================================
 
+# Long tables are split into pieces of this many rows. reportlab lays out
+# (and re-splits at every page break) a table as a whole, so several small
+# tables are much cheaper than one huge one.
+PDF_TABLE_CHUNK_ROWS = 100
+
+
+@lru_cache(maxsize=1)
+def _pdf_table_style():
+    """
+    The look shared by every table in the PDF report: a blue header row
+    with bold white text, and grid lines.
+
+    Built once and reused by every table (and every later PDF). It's a
+    cached function rather than a module-level constant because reportlab
+    is only imported when a PDF is actually made.
+    """
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+
+def _styled_table(data: list, col_widths: list, extra_style: list = None):
+    """
+    Make a PDF table with the shared report style.
+
+    Args:
+        data: Table rows, header row first
+        col_widths: Width of each column
+        extra_style: Optional extra TableStyle commands for just this table
+
+    Returns:
+        A reportlab Table
+    """
+    from reportlab.platypus import Table
+
+    table = Table(data, colWidths=col_widths)
+    table.setStyle(_pdf_table_style())
+    if extra_style:
+        table.setStyle(extra_style)
+    return table
+
+
 def export_pdf(start_date: date, end_date: date, filename: str = None) -> Path:
     """
     Export summary report to PDF.
 
+    The PDF only shows totals, so it uses get_report_summary() rather than
+    loading every row with get_all_data().
+
     Args:
         start_date: Start of date range
         end_date: End of date range
@@ -265,13 +534,18 @@ def export_pdf(start_date: date, end_date: date, filename: str = None) -> Path:
     Returns:
         Path to the created PDF file
     """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
     ensure_export_dir()
 
     if filename is None:
         filename = f"pd_tracker_report_{start_date}_{end_date}.pdf"
 
     filepath = EXPORT_DIR / filename
-    all_data = get_all_data(start_date, end_date)
+    summary = get_report_summary(start_date, end_date)
 
     # Create PDF
     doc = SimpleDocTemplate(str(filepath), pagesize=letter,
@@ -301,121 +575,84 @@ def export_pdf(start_date: date, end_date: date, filename: str = None) -> Path:
     elements.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
     elements.append(Spacer(1, 20))
 
+    # Nothing logged in the period? Then say so, and skip building tables
+    # full of zeros.
+    if not any(summary[name] for name in _SQL_EXPORT_QUERIES):
+        elements.append(Paragraph("No data was logged in this period.", styles['Normal']))
+        doc.build(elements)
+        return filepath
+
     # Summary section
     elements.append(Paragraph("Summary", heading_style))
     summary_data = [
         ["Metric", "Value"],
-        ["Medication doses logged", str(len(all_data['medications']))],
-        ["Symptom entries", str(len(all_data['symptoms']))],
-        ["Sleep logs", str(len(all_data['sleep']))],
-        ["Exercise sessions", str(len(all_data['exercise']))],
+        ["Medication doses logged", str(summary['medications'])],
+        ["Symptom entries", str(summary['symptoms'])],
+        ["Sleep logs", str(summary['sleep'])],
+        ["Exercise sessions", str(summary['exercise'])],
     ]
-    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    summary_table = _styled_table(summary_data, [3*inch, 2*inch], [
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
         ('FONTSIZE', (0, 0), (-1, -1), 10),
         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    ])
     elements.append(summary_table)
     elements.append(Spacer(1, 20))
 
     # Medications section
-    if all_data['medications']:
+    if summary['medications']:
         elements.append(Paragraph("Medication Log", heading_style))
 
-        # Group by medication
-        med_counts = {}
-        for m in all_data['medications']:
-            name = m['medication_name']
-            if name not in med_counts:
-                med_counts[name] = 0
-            med_counts[name] += 1
-
-        med_data = [["Medication", "Doses"]]
-        for name, count in sorted(med_counts.items()):
-            med_data.append([name, str(count)])
-
-        med_table = Table(med_data, colWidths=[3*inch, 1.5*inch])
-        med_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ]))
-        elements.append(med_table)
+        med_rows = [[name, str(count)] for name, count in summary['doses_by_medication']]
+
+        # One table per chunk, each with its own header row
+        for i in range(0, len(med_rows), PDF_TABLE_CHUNK_ROWS):
+            med_data = [["Medication", "Doses"]] + med_rows[i:i + PDF_TABLE_CHUNK_ROWS]
+            med_table = _styled_table(med_data, [3*inch, 1.5*inch], [
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ])
+            elements.append(med_table)
         elements.append(Spacer(1, 20))
 
     # Symptoms section
-    if all_data['symptoms']:
+    if summary['symptoms']:
         elements.append(Paragraph("Symptom Summary", heading_style))
 
-        on_count = sum(1 for s in all_data['symptoms'] if s.get('on_off_state') == 'on')
-        off_count = sum(1 for s in all_data['symptoms'] if s.get('on_off_state') == 'off')
-        trans_count = sum(1 for s in all_data['symptoms'] if s.get('on_off_state') == 'transitioning')
-
+        state_counts = summary['symptom_states']
         symptom_data = [
             ["State", "Count"],
-            ["ON", str(on_count)],
-            ["OFF", str(off_count)],
-            ["Transitioning", str(trans_count)],
+            ["ON", str(state_counts.get('on', 0))],
+            ["OFF", str(state_counts.get('off', 0))],
+            ["Transitioning", str(state_counts.get('transitioning', 0))],
         ]
-        symptom_table = Table(symptom_data, colWidths=[2*inch, 1.5*inch])
-        symptom_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        symptom_table = _styled_table(symptom_data, [2*inch, 1.5*inch])
         elements.append(symptom_table)
         elements.append(Spacer(1, 20))
 
     # Sleep section
-    if all_data['sleep']:
+    if summary['sleep']:
         elements.append(Paragraph("Sleep Summary", heading_style))
 
-        total_nights = len([s for s in all_data['sleep'] if s.get('wake_time')])
-        qualities = [s['quality'] for s in all_data['sleep'] if s.get('quality')]
-        avg_quality = sum(qualities) / len(qualities) if qualities else 0
-
+        avg_quality = summary['sleep_avg_quality']
         sleep_data = [
             ["Metric", "Value"],
-            ["Nights logged", str(total_nights)],
+            ["Nights logged", str(summary['sleep_nights'])],
             ["Avg quality", f"{avg_quality:.1f}/10" if avg_quality else "N/A"],
         ]
-        sleep_table = Table(sleep_data, colWidths=[2*inch, 1.5*inch])
-        sleep_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        sleep_table = _styled_table(sleep_data, [2*inch, 1.5*inch])
         elements.append(sleep_table)
         elements.append(Spacer(1, 20))
 
     # Exercise section
-    if all_data['exercise']:
+    if summary['exercise']:
         elements.append(Paragraph("Exercise Summary", heading_style))
 
-        total_minutes = sum(e['duration_minutes'] for e in all_data['exercise'])
-        total_sessions = len(all_data['exercise'])
-
         exercise_data = [
             ["Metric", "Value"],
-            ["Total sessions", str(total_sessions)],
-            ["Total minutes", str(total_minutes)],
+            ["Total sessions", str(summary['exercise'])],
+            ["Total minutes", str(summary['exercise_minutes'])],
         ]
-        exercise_table = Table(exercise_data, colWidths=[2*inch, 1.5*inch])
-        exercise_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        exercise_table = _styled_table(exercise_data, [2*inch, 1.5*inch])
         elements.append(exercise_table)
 
     # Build PDF
@@ -427,11 +664,18 @@ def export_pdf(start_date: date, end_date: date, filename: str = None) -> Path:
 # CONVENIENCE FUNCTIONS
 # ============================================================
 
-def export_last_week(format: str = 'pdf') -> Path:
-    """Export data from the last 7 days."""
-    end_date = date.today()
-    start_date = end_date - timedelta(days=6)
+def export_report(format: str, start_date: date, end_date: date) -> Path:
+    """
+    Export a full report in the given format.
 
+    Args:
+        format: 'pdf', 'excel', or 'csv' (CSV writes one file per data type)
+        start_date: Start of date range
+        end_date: End of date range
+
+    Returns:
+        Path to the report file (for CSV, the folder holding the files)
+    """
     if format == 'csv':
         return export_csv('all', start_date, end_date)
     elif format == 'excel':
@@ -440,14 +684,13 @@ def export_last_week(format: str = 'pdf') -> Path:
         return export_pdf(start_date, end_date)
 
 
+def export_last_week(format: str = 'pdf') -> Path:
+    """Export data from the last 7 days."""
+    end_date = date.today()
+    return export_report(format, end_date - timedelta(days=6), end_date)
+
+
 def export_last_month(format: str = 'pdf') -> Path:
     """Export data from the last 30 days."""
     end_date = date.today()
-    start_date = end_date - timedelta(days=29)
-
-    if format == 'csv':
-        return export_csv('all', start_date, end_date)
-    elif format == 'excel':
-        return export_excel(start_date, end_date)
-    else:
-        return export_pdf(start_date, end_date)
+    return export_report(format, end_date - timedelta(days=29), end_date)
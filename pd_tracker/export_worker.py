@@ -0,0 +1,110 @@
+"""
+Background report generation for PD Tracker.
+
+Building a PDF or Excel report for a long period can take a while, so
+'pd report generate --async' starts this module in a separate process and
+returns right away. The worker writes its progress to a small status file
+that 'pd report status' reads.
+
+Usage (normally started by the CLI, not by hand):
+    python -m pd_tracker.export_worker START_DATE END_DATE FORMAT [--email]
+"""
+
+import json
+import sys
+from datetime import date, datetime
+
+from .config import EXPORT_DIR
+
+
+# Status of the most recent background report
+STATUS_FILE = EXPORT_DIR / "report_status.json"
+
+
+def write_status(**fields):
+    """
+    Record the state of the background report.
+
+    Written to a temporary file and then renamed, so 'pd report status'
+    never reads a half-written file.
+    """
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = STATUS_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(fields, default=str))
+    tmp.replace(STATUS_FILE)
+
+
+def read_status() -> dict:
+    """
+    Read the state of the most recent background report.
+
+    Returns:
+        Dict with 'state' ('running', 'done' or 'failed') and details,
+        or an empty dict if no background report has been started
+    """
+    try:
+        return json.loads(STATUS_FILE.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def run(start_date: date, end_date: date, format: str, email: bool = False) -> int:
+    """
+    Generate the report (and optionally email it), recording the result.
+
+    Returns:
+        Process exit code: 0 on success, 1 on failure
+    """
+    # Imported here so the status helpers above stay cheap for the CLI
+    from .export import export_report
+
+    # Log in to the mail server while the report is being built
+    session = None
+    if email:
+        from .email_sender import connect_smtp_in_background, is_email_configured
+        if is_email_configured():
+            session = connect_smtp_in_background()
+
+    status = {
+        'format': format,
+        'start_date': start_date,
+        'end_date': end_date,
+        'started': datetime.now(),
+    }
+
+    try:
+        try:
+            filepath = export_report(format, start_date, end_date)
+        except Exception as e:
+            write_status(state='failed', error=str(e), finished=datetime.now(), **status)
+            return 1
+
+        status['path'] = filepath
+
+        if email:
+            from .email_sender import send_report_email
+            result = send_report_email(filepath, session=session)
+            status['email'] = result.get('message') or result.get('error')
+    finally:
+        # Log out of the mail server even if the report failed
+        if session is not None:
+            from .email_sender import close_smtp_session
+            close_smtp_session(session)
+
+    write_status(state='done', finished=datetime.now(), **status)
+    return 0
+
+
+def main(argv=None):
+    """Parse the command line and run the worker."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    email = '--email' in args
+    if email:
+        args.remove('--email')
+
+    start_str, end_str, format = args
+    return run(date.fromisoformat(start_str), date.fromisoformat(end_str), format, email)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
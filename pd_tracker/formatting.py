@@ -0,0 +1,54 @@
+"""
+Small display helpers shared by the CLI and the history formatters.
+
+History commands format a time for every row they print, so these avoid
+strftime (which parses its format string and consults the locale on every
+call) in favour of plain lookups and f-strings.
+"""
+
+from datetime import date
+from functools import lru_cache
+
+
+# Hour (0-23) -> 12-hour clock label and AM/PM, e.g. 0 -> "12" / "AM"
+_HOUR_LABELS = [f"{((h - 1) % 12) + 1}" for h in range(24)]
+_HOUR_AMPM = ["AM"] * 12 + ["PM"] * 12
+
+
+def fmt_clock(dt) -> str:
+    """
+    Format the time of a datetime like "2:30 PM".
+
+    Same result as dt.strftime('%I:%M %p').lstrip('0').
+
+    Args:
+        dt: A datetime (or time) object
+
+    Returns:
+        Time string, e.g. "9:05 AM"
+    """
+    return f"{_HOUR_LABELS[dt.hour]}:{dt.minute:02d} {_HOUR_AMPM[dt.hour]}"
+
+
+@lru_cache(maxsize=128)
+def _fmt_date(day: date, fmt: str) -> str:
+    return day.strftime(fmt)
+
+
+def fmt_day(dt, fmt: str = '%a, %b %d') -> str:
+    """
+    Format the date part of a datetime, e.g. "Mon, Jan 15".
+
+    A history listing shows the same few days over and over, so the
+    strftime result is cached per (day, format).
+
+    Args:
+        dt: A datetime or date object
+        fmt: strftime format for the date (default: '%a, %b %d')
+
+    Returns:
+        Formatted date string
+    """
+    if hasattr(dt, 'date'):
+        dt = dt.date()
+    return _fmt_date(dt, fmt)
@@ -9,9 +9,13 @@ This module provides functions to:
 Each function handles its own database connection to keep things simple.
 """
 
+# perf: do not @jit - these functions spend their time in SQLite, not in
+# Python arithmetic. Speed-ups belong in the queries (indexes, fewer round
+# trips), which a JIT compiler can't help with.
+
 from datetime import datetime, date, timedelta
 from typing import Optional
-from .database import get_connection
+from .database import db_batch, get_connection, get_read_connection
 
 
 # ============================================================
@@ -58,7 +62,7 @@ def get_all_medications(active_only: bool = True) -> list:
     Returns:
         List of medication records (as dict-like Row objects)
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     if active_only:
@@ -74,7 +78,10 @@ def get_all_medications(active_only: bool = True) -> list:
 
 def get_medication_by_name(name: str) -> Optional[dict]:
     """
-    Find a medication by name (case-insensitive partial match).
+    Find a medication by name (case-insensitive, exact match preferred).
+
+    An exact name match wins, so "Sinemet" finds "Sinemet" even if
+    "Sinemet CR" also exists. Otherwise falls back to a partial match.
 
     Args:
         name: Full or partial medication name
@@ -82,16 +89,25 @@ def get_medication_by_name(name: str) -> Optional[dict]:
     Returns:
         The medication record, or None if not found
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
-    # LIKE with % does a partial match, LOWER() makes it case-insensitive
+    # Try an exact (case-insensitive) match first - this uses the
+    # idx_medications_name index, so it doesn't have to scan the table
     cursor.execute(
-        "SELECT * FROM medications WHERE LOWER(name) LIKE LOWER(?) AND active = 1",
-        (f"%{name}%",)
+        "SELECT * FROM medications WHERE name = ? COLLATE NOCASE AND active = 1 LIMIT 1",
+        (name,)
     )
-
     medication = cursor.fetchone()
+
+    if medication is None:
+        # LIKE with % does a partial match, LOWER() makes it case-insensitive
+        cursor.execute(
+            "SELECT * FROM medications WHERE LOWER(name) LIKE LOWER(?) AND active = 1 LIMIT 1",
+            (f"%{name}%",)
+        )
+        medication = cursor.fetchone()
+
     conn.close()
 
     return medication
@@ -107,7 +123,7 @@ def get_medication_by_id(med_id: int) -> Optional[dict]:
     Returns:
         The medication record, or None if not found
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     cursor.execute("SELECT * FROM medications WHERE id = ?", (med_id,))
@@ -222,6 +238,39 @@ def log_dose(medication_id: int, taken_time: datetime = None,
     return dose_id
 
 
+def log_doses_bulk(rows: list) -> list:
+    """
+    Record many doses at once (e.g. catching up on a day of missed logging).
+
+    Everything is saved in one transaction, so the whole batch costs one
+    disk sync instead of one per dose.
+
+    Args:
+        rows: List of (medication_id, taken_time, scheduled_time, notes)
+              tuples. A taken_time of None means now, like log_dose.
+
+    Returns:
+        The IDs of the new dose records, in the same order as rows
+    """
+    now = datetime.now()
+    dose_ids = []
+
+    with db_batch() as conn:
+        cursor = conn.cursor()
+        for medication_id, taken_time, scheduled_time, notes in rows:
+            # RETURNING hands back each new id without a second query
+            cursor.execute(
+                """INSERT INTO doses_taken
+                   (medication_id, taken_time, scheduled_time, notes)
+                   VALUES (?, ?, ?, ?)
+                   RETURNING id""",
+                (medication_id, taken_time or now, scheduled_time, notes)
+            )
+            dose_ids.append(cursor.fetchone()[0])
+
+    return dose_ids
+
+
 def log_skipped_dose(medication_id: int, scheduled_time: datetime = None,
                      notes: str = None) -> int:
     """
@@ -252,21 +301,25 @@ def log_skipped_dose(medication_id: int, scheduled_time: datetime = None,
     return dose_id
 
 
-def get_doses_today(medication_id: int = None) -> list:
+def get_doses_today(medication_id: int = None, today: date = None) -> list:
     """
     Get all doses taken today.
 
     Args:
         medication_id: Optional - filter to specific medication
+        today: Which day counts as today (defaults to date.today())
 
     Returns:
         List of dose records with medication names
     """
-    conn = get_connection()
+    if today is None:
+        today = date.today()
+
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     # Get the start of today
-    today_start = datetime.combine(date.today(), datetime.min.time())
+    today_start = datetime.combine(today, datetime.min.time())
 
     if medication_id:
         cursor.execute(
@@ -303,7 +356,7 @@ def get_last_dose(medication_id: int) -> Optional[dict]:
     Returns:
         The most recent dose record, or None if never taken
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     cursor.execute(
@@ -322,18 +375,75 @@ def get_last_dose(medication_id: int) -> Optional[dict]:
     return dose
 
 
-def get_medication_status_today() -> list:
+def dose_logged_near(medication_id: int, scheduled_time: datetime,
+                     window_seconds: int = 1800) -> bool:
+    """
+    Check whether a dose was logged close to a scheduled time.
+
+    SQLite answers this straight from the (medication_id, taken_time)
+    index and stops at the first match, instead of every dose of the day
+    being loaded and compared in Python.
+
+    Args:
+        medication_id: The medication's database ID
+        scheduled_time: When the dose was due
+        window_seconds: How close (before or after) counts as "near"
+
+    Returns:
+        True if a dose was logged within the window
+    """
+    window = timedelta(seconds=window_seconds)
+
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """SELECT 1 FROM doses_taken
+           WHERE medication_id = ? AND taken_time > ? AND taken_time < ?
+           LIMIT 1""",
+        (medication_id, scheduled_time - window, scheduled_time + window)
+    )
+
+    found = cursor.fetchone() is not None
+    conn.close()
+
+    return found
+
+
+def get_medication_status_today(now: datetime = None) -> list:
     """
     Get today's medication status - what you've taken and when.
 
     This powers the "Did I take my meds?" feature.
 
+    Args:
+        now: The current time (defaults to datetime.now()). Pass this in
+             if you're also displaying the time, so both agree.
+
     Returns:
         List of dicts with medication info and today's doses
     """
+    if now is None:
+        now = datetime.now()
+
     medications = get_all_medications(active_only=True)
-    today_doses = get_doses_today()
+    today_doses = get_doses_today(today=now.date())
+
+    return _build_medication_status(medications, today_doses, now)
+
+
+def _build_medication_status(medications: list, today_doses: list, now: datetime) -> list:
+    """
+    Combine medications and today's doses into the status list.
+
+    Args:
+        medications: Active medication records
+        today_doses: Today's dose records, most recent first
+        now: The current time
 
+    Returns:
+        List of dicts, as described in get_medication_status_today()
+    """
     # Group doses by medication
     doses_by_med = {}
     for dose in today_doses:
@@ -348,19 +458,19 @@ def get_medication_status_today() -> list:
         med_doses = doses_by_med.get(med['id'], [])
 
         # Calculate time since last dose
-        last_dose = None
+        last_time = None
         time_since = None
         if med_doses:
             last_dose = med_doses[0]  # Most recent (already sorted DESC)
-            last_time = datetime.fromisoformat(last_dose['taken_time'])
-            time_since = datetime.now() - last_time
+            last_time = last_dose['taken_time']
+            time_since = now - last_time
 
         status.append({
             'id': med['id'],
             'name': med['name'],
             'dosage': med['dosage'],
             'doses_today': len(med_doses),
-            'last_dose_time': last_dose['taken_time'] if last_dose else None,
+            'last_dose_time': last_time,
             'time_since_last': time_since,
             'dose_times': [d['taken_time'] for d in med_doses]
         })
@@ -368,6 +478,72 @@ def get_medication_status_today() -> list:
     return status
 
 
+def get_today_snapshot(now: datetime = None) -> dict:
+    """
+    Get everything for a "today" summary using a single database connection.
+
+    Runs the medication, dose, symptom, and exercise queries back to back on
+    one connection instead of opening a new connection for each.
+
+    Args:
+        now: The current time (defaults to datetime.now())
+
+    Returns:
+        Dict with:
+            'medications': same as get_medication_status_today()
+            'symptoms': same as symptoms.get_on_off_summary_today()
+            'exercise': same as exercise.get_today_stats()
+    """
+    from .symptoms import summarize_on_off
+    from .exercise import summarize_exercise_today
+
+    if now is None:
+        now = datetime.now()
+    today_start = datetime.combine(now.date(), datetime.min.time())
+
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    # Each query only asks for the columns the summaries below use - a
+    # snapshot never shows notes or the individual symptom scores, so
+    # there's no point reading them off disk
+    cursor.execute("SELECT id, name, dosage FROM medications WHERE active = 1 ORDER BY name")
+    medications = cursor.fetchall()
+
+    cursor.execute(
+        """SELECT medication_id, taken_time
+           FROM doses_taken
+           WHERE taken_time >= ?
+           ORDER BY taken_time DESC""",
+        (today_start,)
+    )
+    today_doses = cursor.fetchall()
+
+    cursor.execute(
+        """SELECT on_off_state, timestamp FROM symptoms
+           WHERE timestamp >= ?
+           ORDER BY timestamp DESC""",
+        (today_start,)
+    )
+    symptoms = cursor.fetchall()
+
+    cursor.execute(
+        """SELECT exercise_type, duration_minutes FROM exercise_logs
+           WHERE start_time >= ?
+           ORDER BY start_time DESC""",
+        (today_start,)
+    )
+    exercise_logs = cursor.fetchall()
+
+    conn.close()
+
+    return {
+        'medications': _build_medication_status(medications, today_doses, now),
+        'symptoms': summarize_on_off(symptoms),
+        'exercise': summarize_exercise_today(exercise_logs),
+    }
+
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
@@ -382,7 +558,7 @@ def get_dose_by_id(dose_id: int) -> Optional[dict]:
     Returns:
         The dose record with medication info, or None if not found
     """
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     cursor.execute(
@@ -490,7 +666,7 @@ def get_doses_range(start_date: date, end_date: date = None,
     start_dt = datetime.combine(start_date, datetime.min.time())
     end_dt = datetime.combine(end_date, datetime.max.time())
 
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     if medication_id:
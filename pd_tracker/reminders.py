@@ -8,11 +8,26 @@ This module handles:
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 from . import config
 
 
+@lru_cache(maxsize=1)
+def _get_client():
+    """
+    Get the Twilio client, creating it on first use.
+
+    The client keeps an HTTP session open to Twilio, so reusing one client
+    lets later messages skip the connection (and TLS handshake) setup.
+    """
+    # Import here to avoid errors if Twilio isn't installed
+    from twilio.rest import Client
+
+    return Client(config.TWILIO_ACCOUNT_SID, config.TWILIO_AUTH_TOKEN)
+
+
 def send_sms(message: str) -> dict:
     """
     Send an SMS message via Twilio.
@@ -24,7 +39,6 @@ def send_sms(message: str) -> dict:
         Dict with 'success' boolean and either 'sid' (message ID) or 'error'
     """
     # Import here to avoid errors if Twilio isn't configured yet
-    from twilio.rest import Client
     from twilio.base.exceptions import TwilioRestException
 
     if not config.is_twilio_configured():
@@ -34,9 +48,7 @@ def send_sms(message: str) -> dict:
         }
 
     try:
-        client = Client(config.TWILIO_ACCOUNT_SID, config.TWILIO_AUTH_TOKEN)
-
-        message = client.messages.create(
+        message = _get_client().messages.create(
             body=message,
             from_=config.TWILIO_PHONE_NUMBER,
             to=config.USER_PHONE_NUMBER
@@ -87,6 +99,39 @@ def send_medication_reminder(medication_name: str, dosage: Optional[str] = None,
     return send_sms(message)
 
 
+def send_batched_reminders(reminders: list) -> dict:
+    """
+    Send one SMS listing several doses that are due together.
+
+    At wake-up several medications are often due at once. One message for
+    all of them means one request to Twilio instead of one per dose (and
+    one text for the user instead of a burst of them).
+
+    Args:
+        reminders: Reminder dicts from schedules.get_due_reminders()
+                   (uses 'medication_name', 'dosage' and 'scheduled_time')
+
+    Returns:
+        Result dict from send_sms()
+    """
+    # A single dose gets the usual message
+    if len(reminders) == 1:
+        r = reminders[0]
+        return send_medication_reminder(r['medication_name'], r['dosage'], r['scheduled_time'])
+
+    lines = []
+    for r in reminders:
+        if r['dosage']:
+            med_str = f"{r['medication_name']} ({r['dosage']})"
+        else:
+            med_str = r['medication_name']
+        time_str = r['scheduled_time'].strftime("%I:%M %p").lstrip('0')
+        lines.append(f"• {time_str} {med_str}")
+
+    message = "💊 PD Tracker Reminder\n\nTime to take:\n" + "\n".join(lines)
+    return send_sms(message)
+
+
 def send_missed_dose_followup(medication_name: str, dosage: Optional[str] = None,
                                scheduled_time: Optional[datetime] = None) -> dict:
     """
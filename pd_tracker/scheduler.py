@@ -13,7 +13,11 @@ ensuring reminders aren't lost on restart and duplicates aren't sent.
 
 Flow:
 1. When user logs "I'm Awake", generate_wake_based_reminders() populates pending_reminders
-2. This scheduler checks pending_reminders every minute
+2. This scheduler checks pending_reminders every minute, or sooner when a
+   reminder or follow-up is due before then (while the user is asleep it
+   only does a quick has-anything-changed check). Wake/sleep events and
+   schedule changes are logged by the CLI or web app, which are separate
+   programs, so they're picked up at the next check.
 3. Sends SMS for due reminders (reminder_time <= now, not sent)
 4. Marks reminders as sent in database
 5. Sends follow-up for overdue reminders (15 min after, dose not logged)
@@ -25,75 +29,128 @@ import sys
 from datetime import datetime
 
 from . import config
+from .database import get_data_version, optimize_database
 from .schedules import (
     get_due_reminders,
     get_overdue_reminders,
-    mark_reminder_sent,
-    mark_followup_sent,
+    mark_reminders_sent,
+    mark_followups_sent,
     get_all_active_schedules,
+    get_next_followup_time,
+    get_next_pending_reminder_time,
     is_user_awake,
 )
-from .reminders import send_medication_reminder, send_missed_dose_followup
+from .reminders import send_batched_reminders, send_missed_dose_followup
 
 
-def check_and_send_reminders():
+def _seconds_until_next_check(check_interval: int) -> float:
+    """
+    Work out how long the main loop can sleep.
+
+    Normally check_interval, but shorter if a reminder or follow-up is due
+    before then, so it goes out on time instead of up to a whole interval
+    late.
+    """
+    due_times = [
+        t for t in (
+            get_next_pending_reminder_time(),
+            get_next_followup_time(minutes=config.FOLLOWUP_MINUTES_AFTER),
+        )
+        if t is not None
+    ]
+    if not due_times:
+        return check_interval
+
+    seconds = (min(due_times) - datetime.now()).total_seconds()
+    return min(check_interval, max(1, seconds))
+
+
+def check_and_send_reminders(awake: bool = None):
     """
     Check for due reminders and send them.
 
     Uses the pending_reminders table for persistence.
+
+    Args:
+        awake: Whether the user is awake, if already known (looked up
+               otherwise)
     """
     now = datetime.now()
 
     # Only send reminders if user is awake
-    if not is_user_awake():
+    if awake is None:
+        awake = is_user_awake()
+    if not awake:
         return
 
     # Get reminders that are due now (reminder_time <= now, not sent)
     due_reminders = get_due_reminders()
 
+    # Doses scheduled for the same minute go out together in one SMS
+    groups = {}
     for reminder in due_reminders:
-        med_name = reminder['medication_name']
-        dosage = reminder['dosage']
-        scheduled_time = reminder['scheduled_time']
+        minute = reminder['scheduled_time'].replace(second=0, microsecond=0)
+        groups.setdefault(minute, []).append(reminder)
+
+    # Everything sent this time is marked with one UPDATE at the end. The
+    # finally makes sure that still happens if something goes wrong part
+    # way through, so nothing already sent gets sent twice.
+    sent_ids = []
+    try:
+        for scheduled_time, group in groups.items():
+            med_names = ", ".join(r['medication_name'] for r in group)
 
-        print(f"[{now.strftime('%H:%M')}] Sending reminder: {med_name} due at {scheduled_time.strftime('%I:%M %p')}")
+            print(f"[{now.strftime('%H:%M')}] Sending reminder: {med_names} due at {scheduled_time.strftime('%I:%M %p')}")
 
-        result = send_medication_reminder(med_name, dosage, scheduled_time)
+            result = send_batched_reminders(group)
 
-        if result['success']:
-            mark_reminder_sent(reminder['id'])
-            print(f"  ✓ Reminder sent")
-        else:
-            print(f"  ✗ Failed: {result['error']}")
+            if result['success']:
+                sent_ids.extend(r['id'] for r in group)
+                print(f"  ✓ Reminder sent")
+            else:
+                print(f"  ✗ Failed: {result['error']}")
+    finally:
+        mark_reminders_sent(sent_ids)
 
 
-def check_and_send_followups():
+def check_and_send_followups(awake: bool = None):
     """
     Check for overdue reminders (dose not logged) and send follow-ups.
+
+    Args:
+        awake: Whether the user is awake, if already known (looked up
+               otherwise)
     """
     now = datetime.now()
 
     # Only send follow-ups if user is awake
-    if not is_user_awake():
+    if awake is None:
+        awake = is_user_awake()
+    if not awake:
         return
 
     # Get reminders that are overdue (sent but dose not logged within 15 min)
     overdue = get_overdue_reminders(minutes=config.FOLLOWUP_MINUTES_AFTER)
 
-    for reminder in overdue:
-        med_name = reminder['medication_name']
-        dosage = reminder['dosage']
-        scheduled_time = reminder['scheduled_time']
+    # Marked all together at the end, like check_and_send_reminders()
+    sent_ids = []
+    try:
+        for reminder in overdue:
+            med_name = reminder['medication_name']
+            dosage = reminder['dosage']
+            scheduled_time = reminder['scheduled_time']
 
-        print(f"[{now.strftime('%H:%M')}] Sending follow-up: {med_name} was due at {scheduled_time.strftime('%I:%M %p')}")
+            print(f"[{now.strftime('%H:%M')}] Sending follow-up: {med_name} was due at {scheduled_time.strftime('%I:%M %p')}")
 
-        result = send_missed_dose_followup(med_name, dosage, scheduled_time)
+            result = send_missed_dose_followup(med_name, dosage, scheduled_time)
 
-        if result['success']:
-            mark_followup_sent(reminder['id'])
-            print(f"  ✓ Follow-up sent")
-        else:
-            print(f"  ✗ Failed: {result['error']}")
+            if result['success']:
+                sent_ids.append(reminder['id'])
+                print(f"  ✓ Follow-up sent")
+            else:
+                print(f"  ✗ Failed: {result['error']}")
+    finally:
+        mark_followups_sent(sent_ids)
 
 
 def run_scheduler(check_interval: int = 60):
@@ -140,12 +197,37 @@ def run_scheduler(check_interval: int = 60):
         print("Use the web UI or CLI to set up schedules.")
     print()
 
+    # When database upkeep last ran (time.monotonic() isn't affected by
+    # clock changes)
+    last_maintenance = time.monotonic()
+
+    # Database version at the last check that found the user asleep
+    # (None while awake)
+    asleep_version = None
+
     # Main loop
     while True:
         try:
-            check_and_send_reminders()
-            check_and_send_followups()
-            time.sleep(check_interval)
+            # While asleep nothing can be sent until the CLI or web app
+            # saves something (like "I'm awake"), so skip the full check
+            # until the database version says something changed. This still
+            # runs every check_interval, so waking up is noticed just as fast.
+            version = get_data_version()
+            if version != asleep_version:
+                # Look up awake/asleep once per check, for both steps
+                awake = is_user_awake()
+                check_and_send_reminders(awake)
+                check_and_send_followups(awake)
+                asleep_version = None if awake else version
+
+            if time.monotonic() - last_maintenance >= config.DB_MAINTENANCE_MINUTES * 60:
+                optimize_database()
+                last_maintenance = time.monotonic()
+
+            if asleep_version is None:
+                time.sleep(_seconds_until_next_check(check_interval))
+            else:
+                time.sleep(check_interval)
         except Exception as e:
             print(f"[{datetime.now().strftime('%H:%M')}] Error: {e}")
             time.sleep(check_interval)
@@ -16,6 +16,9 @@ The key feature is wake-based scheduling:
 - The schedule runs until the user logs going to sleep
 """
 
+# perf: do not @jit - schedule math works on datetime objects and JSON,
+# neither of which Numba supports. The cost here is database round trips.
+
 import json
 from datetime import datetime, date, time, timedelta
 from typing import Optional, List
@@ -140,7 +143,7 @@ def get_last_wake_event() -> Optional[dict]:
         return {
             'id': row['id'],
             'event_type': row['event_type'],
-            'event_time': datetime.fromisoformat(row['event_time']) if isinstance(row['event_time'], str) else row['event_time'],
+            'event_time': row['event_time'],
             'notes': row['notes'],
         }
     return None
@@ -169,32 +172,57 @@ def get_last_sleep_event() -> Optional[dict]:
         return {
             'id': row['id'],
             'event_type': row['event_type'],
-            'event_time': datetime.fromisoformat(row['event_time']) if isinstance(row['event_time'], str) else row['event_time'],
+            'event_time': row['event_time'],
             'notes': row['notes'],
         }
     return None
 
 
-def is_user_awake() -> bool:
+def get_awake_state() -> tuple:
     """
-    Check if the user is currently awake (logged wake but not sleep).
+    Get the latest wake and sleep times with a single query.
 
     Returns:
-        True if awake, False otherwise
+        (is_awake, last_wake_time, last_sleep_time). The times are None
+        if that kind of event has never been logged.
     """
-    wake = get_last_wake_event()
-    sleep = get_last_sleep_event()
+    conn = get_connection()
+    cursor = conn.cursor()
 
-    if not wake:
-        return False
+    # Two MAX() subqueries in one statement. Each is answered by a single
+    # lookup at the end of the (event_type, event_time) index - a GROUP BY
+    # would read through every event ever logged. MAX() has no declared
+    # type, so the column names ask for the TIMESTAMP converter.
+    cursor.execute(
+        """SELECT
+               (SELECT MAX(event_time) FROM wake_sleep_events
+                WHERE event_type = 'wake') AS "wake_time [TIMESTAMP]",
+               (SELECT MAX(event_time) FROM wake_sleep_events
+                WHERE event_type = 'sleep') AS "sleep_time [TIMESTAMP]"
+        """
+    )
 
-    if not sleep:
-        return True
+    wake_time, sleep_time = cursor.fetchone()
+    conn.close()
+
+    if not wake_time:
+        is_awake = False
+    elif not sleep_time:
+        is_awake = True
+    else:
+        is_awake = wake_time > sleep_time
 
-    wake_time = wake['event_time']
-    sleep_time = sleep['event_time']
+    return is_awake, wake_time, sleep_time
+
+
+def is_user_awake() -> bool:
+    """
+    Check if the user is currently awake (logged wake but not sleep).
 
-    return wake_time > sleep_time
+    Returns:
+        True if awake, False otherwise
+    """
+    return get_awake_state()[0]
 
 
 def get_wake_duration() -> Optional[timedelta]:
@@ -449,6 +477,16 @@ def delete_schedule(medication_id: int) -> bool:
 # WAKE-BASED REMINDER GENERATION
 # ============================================================
 
+# Adds one pending reminder: (medication_id, scheduled_time, reminder_time).
+# The functions below collect their rows first and insert them all with a
+# single executemany().
+_SQL_INSERT_PENDING_REMINDER = """
+    INSERT INTO pending_reminders
+    (medication_id, scheduled_time, reminder_time)
+    VALUES (?, ?, ?)
+"""
+
+
 def generate_wake_based_reminders(wake_time: datetime):
     """
     Generate pending reminders based on wake time.
@@ -480,6 +518,7 @@ def generate_wake_based_reminders(wake_time: datetime):
     )
 
     today = date.today()
+    rows = []
 
     for sched in schedules:
         if not sched['reminders_enabled']:
@@ -493,7 +532,7 @@ def generate_wake_based_reminders(wake_time: datetime):
             # Immediate reminder on waking
             scheduled = wake_time
             reminder = wake_time  # Remind immediately
-            _add_pending_reminder(cursor, med_id, scheduled, reminder)
+            rows.append((med_id, scheduled, reminder))
 
         elif stype == 'interval_from_wake':
             # Every X hours from wake time
@@ -503,25 +542,23 @@ def generate_wake_based_reminders(wake_time: datetime):
             # First dose immediately on wake
             scheduled = wake_time
             reminder = wake_time
-            _add_pending_reminder(cursor, med_id, scheduled, reminder)
+            rows.append((med_id, scheduled, reminder))
 
             # Subsequent doses every interval
             # Assume 18-hour wake window (will stop when user logs sleep)
             max_wake_hours = 18
-            current = wake_time + interval
-            end_of_day = wake_time + timedelta(hours=max_wake_hours)
+            # Dividing timedeltas is exact, unlike 18 / interval_hours
+            n_steps = timedelta(hours=max_wake_hours) // interval
 
-            while current <= end_of_day:
-                # Reminder 5 minutes before
-                reminder = current - timedelta(minutes=5)
-                _add_pending_reminder(cursor, med_id, current, reminder)
-                current += interval
+            # Reminder 5 minutes before each one
+            doses = [wake_time + interval * step for step in range(1, n_steps + 1)]
+            rows.extend((med_id, dose, dose - timedelta(minutes=5)) for dose in doses)
 
         elif stype == 'mid_day':
             # Approximate mid-day (6 hours after wake)
             scheduled = wake_time + timedelta(hours=6)
             reminder = scheduled - timedelta(minutes=5)
-            _add_pending_reminder(cursor, med_id, scheduled, reminder)
+            rows.append((med_id, scheduled, reminder))
 
         elif stype == 'fixed':
             # Fixed daily times (not wake-based)
@@ -535,28 +572,18 @@ def generate_wake_based_reminders(wake_time: datetime):
                 if scheduled > wake_time:
                     # Reminder 5 minutes before
                     reminder = scheduled - timedelta(minutes=5)
-                    _add_pending_reminder(cursor, med_id, scheduled, reminder)
+                    rows.append((med_id, scheduled, reminder))
 
         # Note: night_wake, monthly_injection, and prn are not handled here
         # - night_wake: needs separate trigger when user logs night waking
         # - monthly_injection: uses get_next_injection_due() for tracking
         # - prn: no automatic reminders by design
 
+    cursor.executemany(_SQL_INSERT_PENDING_REMINDER, rows)
     conn.commit()
     conn.close()
 
 
-def _add_pending_reminder(cursor, medication_id: int, scheduled_time: datetime,
-                          reminder_time: datetime):
-    """Helper to add a pending reminder."""
-    cursor.execute(
-        """INSERT INTO pending_reminders
-           (medication_id, scheduled_time, reminder_time)
-           VALUES (?, ?, ?)""",
-        (medication_id, scheduled_time, reminder_time)
-    )
-
-
 def trigger_night_wake_reminders():
     """
     Generate reminders for 'night_wake' schedule type.
@@ -569,6 +596,7 @@ def trigger_night_wake_reminders():
 
     conn = get_connection()
     cursor = conn.cursor()
+    rows = []
 
     for sched in schedules:
         if not sched['reminders_enabled']:
@@ -577,8 +605,9 @@ def trigger_night_wake_reminders():
         if sched['schedule_type'] == 'night_wake':
             med_id = sched['medication_id']
             # Immediate reminder for night wake medications
-            _add_pending_reminder(cursor, med_id, now, now)
+            rows.append((med_id, now, now))
 
+    cursor.executemany(_SQL_INSERT_PENDING_REMINDER, rows)
     conn.commit()
     conn.close()
 
@@ -640,23 +669,37 @@ def record_injection_taken(medication_id: int, taken_date: date = None) -> bool:
     return update_schedule(schedule['id'], times_data=times_data)
 
 
-def get_pending_reminders() -> list:
+def get_pending_reminders(due_by: datetime = None) -> list:
     """
     Get all pending (unsent) reminders.
 
+    Args:
+        due_by: Only include reminders due at or before this time
+                (default: all of them)
+
     Returns:
         List of pending reminders with medication info
     """
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        """SELECT pr.*, m.name as medication_name, m.dosage
-           FROM pending_reminders pr
-           JOIN medications m ON pr.medication_id = m.id
-           WHERE pr.sent = 0
-           ORDER BY pr.reminder_time"""
-    )
+    if due_by is None:
+        cursor.execute(
+            """SELECT pr.*, m.name as medication_name, m.dosage
+               FROM pending_reminders pr
+               JOIN medications m ON pr.medication_id = m.id
+               WHERE pr.sent = 0
+               ORDER BY pr.reminder_time"""
+        )
+    else:
+        cursor.execute(
+            """SELECT pr.*, m.name as medication_name, m.dosage
+               FROM pending_reminders pr
+               JOIN medications m ON pr.medication_id = m.id
+               WHERE pr.sent = 0 AND pr.reminder_time <= ?
+               ORDER BY pr.reminder_time""",
+            (due_by,)
+        )
 
     rows = cursor.fetchall()
     conn.close()
@@ -668,8 +711,8 @@ def get_pending_reminders() -> list:
             'medication_id': row['medication_id'],
             'medication_name': row['medication_name'],
             'dosage': row['dosage'],
-            'scheduled_time': datetime.fromisoformat(row['scheduled_time']) if isinstance(row['scheduled_time'], str) else row['scheduled_time'],
-            'reminder_time': datetime.fromisoformat(row['reminder_time']) if isinstance(row['reminder_time'], str) else row['reminder_time'],
+            'scheduled_time': row['scheduled_time'],
+            'reminder_time': row['reminder_time'],
             'sent': row['sent'],
             'followup_sent': row['followup_sent'],
         })
@@ -684,27 +727,146 @@ def get_due_reminders() -> list:
     Returns:
         List of reminders where reminder_time <= now and not yet sent
     """
-    now = datetime.now()
-    pending = get_pending_reminders()
+    # The time check happens in SQLite (on the (sent, reminder_time) index),
+    # so the rest of the day's reminders aren't loaded every minute
+    return get_pending_reminders(due_by=datetime.now())
+
+
+def get_next_pending_reminder_time(after: datetime = None) -> Optional[datetime]:
+    """
+    Get when the next unsent reminder is due.
+
+    Lets the reminder service sleep until exactly then instead of checking
+    on a fixed beat. A single MIN() on the (sent, reminder_time) index.
+
+    Args:
+        after: Only look at reminders due after this time (defaults to now),
+               so ones that are already due but couldn't be sent are skipped
+
+    Returns:
+        The reminder time, or None if nothing is coming up
+    """
+    if after is None:
+        after = datetime.now()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # MIN() has no declared type, so the column name asks for the
+    # TIMESTAMP converter (see PARSE_COLNAMES in database.py)
+    cursor.execute(
+        """SELECT MIN(reminder_time) AS "next_time [TIMESTAMP]"
+           FROM pending_reminders
+           WHERE sent = 0 AND reminder_time > ?""",
+        (after,)
+    )
+
+    next_time = cursor.fetchone()[0]
+    conn.close()
+
+    return next_time
+
+
+def get_next_followup_time(minutes: int = 15, after: datetime = None) -> Optional[datetime]:
+    """
+    Get when the next follow-up check is due.
+
+    A sent reminder gets a follow-up `minutes` after its scheduled time
+    (if the dose still hasn't been logged then). Like
+    get_next_pending_reminder_time(), this lets the reminder service sleep
+    until exactly that moment.
+
+    Args:
+        minutes: Minutes past scheduled time to consider overdue
+        after: Only look at follow-ups due after this time (defaults to now)
+
+    Returns:
+        The time the next follow-up is due, or None if none are coming up
+    """
+    if after is None:
+        after = datetime.now()
+    delay = timedelta(minutes=minutes)
+
+    conn = get_connection()
+    cursor = conn.cursor()
 
-    return [r for r in pending if r['reminder_time'] <= now and not r['sent']]
+    # Reads from the idx_pending_reminders_followup partial index
+    cursor.execute(
+        """SELECT MIN(scheduled_time) AS "next_time [TIMESTAMP]"
+           FROM pending_reminders
+           WHERE sent = 1 AND followup_sent = 0 AND scheduled_time > ?""",
+        (after - delay,)
+    )
+
+    next_scheduled = cursor.fetchone()[0]
+    conn.close()
+
+    if next_scheduled is None:
+        return None
+    return next_scheduled + delay
 
 
 def mark_reminder_sent(reminder_id: int) -> bool:
-    """Mark a reminder as sent."""
+    """Mark a reminder as sent (see mark_reminders_sent() for several at once)."""
+    return mark_reminders_sent([reminder_id]) > 0
+
+
+def mark_reminders_sent(reminder_ids: list) -> int:
+    """
+    Mark several reminders as sent with a single UPDATE.
+
+    Args:
+        reminder_ids: IDs of the pending_reminders rows
+
+    Returns:
+        Number of reminders updated
+    """
+    if not reminder_ids:
+        return 0
+
     conn = get_connection()
     cursor = conn.cursor()
 
+    placeholders = ", ".join("?" * len(reminder_ids))
     cursor.execute(
-        "UPDATE pending_reminders SET sent = 1 WHERE id = ?",
-        (reminder_id,)
+        f"UPDATE pending_reminders SET sent = 1 WHERE id IN ({placeholders})",
+        list(reminder_ids)
     )
 
-    success = cursor.rowcount > 0
+    updated = cursor.rowcount
     conn.commit()
     conn.close()
 
-    return success
+    return updated
+
+
+def mark_followups_sent(reminder_ids: list) -> int:
+    """
+    Mark several follow-ups as sent with a single UPDATE.
+
+    Args:
+        reminder_ids: IDs of the pending_reminders rows
+
+    Returns:
+        Number of reminders updated
+    """
+    if not reminder_ids:
+        return 0
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    placeholders = ", ".join("?" * len(reminder_ids))
+    cursor.execute(
+        f"UPDATE pending_reminders SET followup_sent = 1 WHERE id IN ({placeholders})",
+        list(reminder_ids)
+    )
+
+    updated = cursor.rowcount
+    conn.commit()
+    conn.close()
+
+    return updated
 
 
 def get_overdue_reminders(minutes: int = 15) -> list:
@@ -717,7 +879,7 @@ def get_overdue_reminders(minutes: int = 15) -> list:
     Returns:
         List of overdue reminders needing follow-up
     """
-    from .models import get_doses_today
+    from .models import dose_logged_near
 
     now = datetime.now()
     cutoff = now - timedelta(minutes=minutes)
@@ -741,20 +903,11 @@ def get_overdue_reminders(minutes: int = 15) -> list:
     overdue = []
     for row in rows:
         med_id = row['medication_id']
-        scheduled = datetime.fromisoformat(row['scheduled_time']) if isinstance(row['scheduled_time'], str) else row['scheduled_time']
-
-        # Check if dose was logged near the scheduled time
-        today_doses = get_doses_today(med_id)
-        dose_logged = False
+        scheduled = row['scheduled_time']
 
-        for dose in today_doses:
-            dose_time = datetime.fromisoformat(dose['taken_time'])
-            # Consider logged if within 30 minutes of scheduled
-            if abs((dose_time - scheduled).total_seconds()) < 1800:
-                dose_logged = True
-                break
-
-        if not dose_logged:
+        # Consider it logged if a dose was taken within 30 minutes of
+        # the scheduled time
+        if not dose_logged_near(med_id, scheduled, window_seconds=1800):
             overdue.append({
                 'id': row['id'],
                 'medication_id': med_id,
@@ -767,20 +920,8 @@ def get_overdue_reminders(minutes: int = 15) -> list:
 
 
 def mark_followup_sent(reminder_id: int) -> bool:
-    """Mark a followup reminder as sent."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "UPDATE pending_reminders SET followup_sent = 1 WHERE id = ?",
-        (reminder_id,)
-    )
-
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-
-    return success
+    """Mark a followup reminder as sent (see mark_followups_sent() for several at once)."""
+    return mark_followups_sent([reminder_id]) > 0
 
 
 # ============================================================
@@ -803,9 +944,44 @@ def get_scheduled_times_for_today(medication_id: int) -> list:
     if not schedule:
         return []
 
+    return _calculate_times_for_today(schedule, get_last_wake_event())
+
+
+def get_all_active_schedules_with_today_times() -> list:
+    """
+    Get all active schedules along with each one's dose times for today.
+
+    Same as calling get_scheduled_times_for_today() for every schedule,
+    but the schedules and the wake event are only looked up once.
+
+    Returns:
+        List of schedules from get_all_active_schedules(), each with an
+        extra 'today_times' key (sorted list of datetimes)
+    """
+    schedules = get_all_active_schedules()
+    if not schedules:
+        return []
+
+    wake = get_last_wake_event()
+    for sched in schedules:
+        sched['today_times'] = _calculate_times_for_today(sched, wake)
+
+    return schedules
+
+
+def _calculate_times_for_today(schedule: dict, wake: Optional[dict]) -> list:
+    """
+    Work out today's dose times from a schedule, without touching the database.
+
+    Args:
+        schedule: Schedule dict (needs 'schedule_type' and 'times_data')
+        wake: Dict from get_last_wake_event(), or None
+
+    Returns:
+        Sorted list of datetime objects for today's scheduled doses
+    """
     today = date.today()
     times = []
-    wake = get_last_wake_event()
 
     stype = schedule['schedule_type']
     data = schedule['times_data']
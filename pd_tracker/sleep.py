@@ -13,7 +13,32 @@ manual entry for past sleep sessions.
 
 from datetime import datetime, date, timedelta
 from typing import Optional
-from .database import get_connection
+from .database import get_connection, get_read_connection, db_batch
+from .formatting import fmt_clock, fmt_day
+
+
+# ============================================================
+# SQL
+# The statements the sleep logging functions run, kept in one place.
+# The session INSERT is shared by log_sleep_session() and
+# log_sleep_sessions(), so both always write the same columns.
+# (Compiled statements are reused between calls because get_connection()
+# keeps one connection open with a statement cache - see database.py.)
+# ============================================================
+
+_SQL_INSERT_SLEEP_START = """INSERT INTO sleep_logs (sleep_time, notes, logged_at)
+                             VALUES (?, ?, ?)"""
+
+_SQL_INSERT_SLEEP_SESSION = """INSERT INTO sleep_logs (sleep_time, wake_time, quality, notes, logged_at)
+                               VALUES (?, ?, ?, ?, ?)"""
+
+_SQL_SELECT_OPEN_SLEEP = """SELECT id, notes FROM sleep_logs
+                            WHERE wake_time IS NULL
+                            ORDER BY sleep_time DESC LIMIT 1"""
+
+_SQL_COMPLETE_SLEEP = """UPDATE sleep_logs
+                         SET wake_time = ?, quality = ?, notes = ?
+                         WHERE id = ?"""
 
 
 def log_sleep_start(sleep_time: datetime = None, notes: str = None) -> int:
@@ -29,17 +54,14 @@ def log_sleep_start(sleep_time: datetime = None, notes: str = None) -> int:
     Returns:
         The ID of the new sleep record
     """
+    now = datetime.now()
     if sleep_time is None:
-        sleep_time = datetime.now()
+        sleep_time = now
 
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        """INSERT INTO sleep_logs (sleep_time, notes, logged_at)
-           VALUES (?, ?, ?)""",
-        (sleep_time, notes, datetime.now())
-    )
+    cursor.execute(_SQL_INSERT_SLEEP_START, (sleep_time, notes, now))
 
     sleep_id = cursor.lastrowid
     conn.commit()
@@ -67,11 +89,7 @@ def log_wake(wake_time: datetime = None, quality: int = None, notes: str = None)
     cursor = conn.cursor()
 
     # Find the most recent sleep record without a wake time
-    cursor.execute(
-        """SELECT id, notes FROM sleep_logs
-           WHERE wake_time IS NULL
-           ORDER BY sleep_time DESC LIMIT 1"""
-    )
+    cursor.execute(_SQL_SELECT_OPEN_SLEEP)
     row = cursor.fetchone()
 
     if not row:
@@ -89,12 +107,7 @@ def log_wake(wake_time: datetime = None, quality: int = None, notes: str = None)
     else:
         combined_notes = existing_notes
 
-    cursor.execute(
-        """UPDATE sleep_logs
-           SET wake_time = ?, quality = ?, notes = ?
-           WHERE id = ?""",
-        (wake_time, quality, combined_notes, sleep_id)
-    )
+    cursor.execute(_SQL_COMPLETE_SLEEP, (wake_time, quality, combined_notes, sleep_id))
 
     conn.commit()
     conn.close()
@@ -124,8 +137,7 @@ def log_sleep_session(
     cursor = conn.cursor()
 
     cursor.execute(
-        """INSERT INTO sleep_logs (sleep_time, wake_time, quality, notes, logged_at)
-           VALUES (?, ?, ?, ?, ?)""",
+        _SQL_INSERT_SLEEP_SESSION,
         (sleep_time, wake_time, quality, notes, datetime.now())
     )
 
@@ -136,6 +148,30 @@ def log_sleep_session(
     return sleep_id
 
 
+def log_sleep_sessions(sessions: list) -> int:
+    """
+    Log many complete sleep sessions at once (e.g. from an import).
+
+    All rows go in with one executemany inside a single transaction, so
+    importing a few hundred nights costs one disk sync instead of hundreds.
+
+    Args:
+        sessions: List of (sleep_time, wake_time, quality, notes) tuples
+
+    Returns:
+        Number of sleep records added
+    """
+    logged_at = datetime.now()
+
+    with db_batch() as conn:
+        conn.executemany(
+            _SQL_INSERT_SLEEP_SESSION,
+            [(*session, logged_at) for session in sessions]
+        )
+
+    return len(sessions)
+
+
 def get_open_sleep_record() -> Optional[dict]:
     """
     Get the current open sleep record (started but not completed).
@@ -348,19 +384,20 @@ def calculate_duration(sleep_time: datetime, wake_time: datetime) -> timedelta:
     return wake_time - sleep_time
 
 
-def format_duration(td: timedelta) -> str:
+def format_duration(td) -> str:
     """
     Format a duration for display.
 
     Args:
-        td: Duration as timedelta
+        td: Duration as a timedelta, or a number of seconds
 
     Returns:
         String like "7h 30m"
     """
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
+    if isinstance(td, timedelta):
+        td = td.total_seconds()
+    hours, rest = divmod(int(td), 3600)
+    minutes = rest // 60
 
     if hours > 0:
         return f"{hours}h {minutes}m"
@@ -378,39 +415,43 @@ def get_sleep_stats(days: int = 7) -> dict:
     Returns:
         Dict with avg_duration, avg_quality, total_nights
     """
-    logs = get_sleep_logs(days)
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    start_date = datetime.now() - timedelta(days=days)
 
-    # Filter to complete records only
-    complete = [l for l in logs if l['wake_time'] is not None]
+    # Let SQLite do the averaging instead of pulling every night into Python.
+    # julianday() gives days as a fraction, so * 86400 turns it into seconds.
+    # Only complete records (with a wake time) count, and nights with no
+    # quality rating (NULL or 0) are left out of the quality average.
+    cursor.execute(
+        """SELECT COUNT(*) AS total_nights,
+                  AVG((julianday(wake_time) - julianday(sleep_time)) * 86400) AS avg_seconds,
+                  AVG(NULLIF(quality, 0)) AS avg_quality
+           FROM sleep_logs
+           WHERE sleep_time >= ? AND wake_time IS NOT NULL""",
+        (start_date,)
+    )
+    row = cursor.fetchone()
+    conn.close()
 
-    if not complete:
+    if row['total_nights'] == 0:
         return {
             'avg_duration': None,
             'avg_quality': None,
             'total_nights': 0,
         }
 
-    # Calculate durations
-    durations = []
-    qualities = []
-
-    for log in complete:
-        duration = calculate_duration(log['sleep_time'], log['wake_time'])
-        durations.append(duration.total_seconds())
-
-        if log['quality']:
-            qualities.append(log['quality'])
-
-    avg_duration_seconds = sum(durations) / len(durations)
-    avg_duration = timedelta(seconds=avg_duration_seconds)
-
-    avg_quality = sum(qualities) / len(qualities) if qualities else None
+    # julianday() math is floating point, so round to whole seconds
+    # (otherwise 8h 30m can come back as 8h 29m 59.999s)
+    avg_seconds = round(row['avg_seconds'])
+    avg_quality = row['avg_quality']
 
     return {
-        'avg_duration': avg_duration,
-        'avg_duration_formatted': format_duration(avg_duration),
+        'avg_duration': timedelta(seconds=avg_seconds),
+        'avg_duration_formatted': format_duration(avg_seconds),
         'avg_quality': round(avg_quality, 1) if avg_quality else None,
-        'total_nights': len(complete),
+        'total_nights': row['total_nights'],
     }
 
 
@@ -426,14 +467,14 @@ def format_sleep_entry(log: dict) -> str:
     """
     lines = []
 
-    sleep_time = datetime.fromisoformat(log['sleep_time'])
-    lines.append(f"  {sleep_time.strftime('%a, %b %d')}")
-    lines.append(f"    Sleep: {sleep_time.strftime('%I:%M %p').lstrip('0')}")
+    sleep_time = log['sleep_time']
+    lines.append(f"  {fmt_day(sleep_time)}")
+    lines.append(f"    Sleep: {fmt_clock(sleep_time)}")
 
     if log['wake_time']:
-        wake_time = datetime.fromisoformat(log['wake_time'])
+        wake_time = log['wake_time']
         duration = calculate_duration(sleep_time, wake_time)
-        lines.append(f"    Wake:  {wake_time.strftime('%I:%M %p').lstrip('0')}")
+        lines.append(f"    Wake:  {fmt_clock(wake_time)}")
         lines.append(f"    Duration: {format_duration(duration)}")
     else:
         lines.append(f"    Wake:  (still sleeping)")
@@ -10,9 +10,14 @@ Tracks Parkinson's disease symptoms including:
 Each symptom can be rated 0-10 where 0 means not present.
 """
 
+# perf: do not @jit - symptom logging is a handful of inserts and small
+# SELECTs plus string formatting; there is no numeric loop worth compiling.
+
+from collections import Counter
 from datetime import datetime, date, timedelta
 from typing import Optional
 from .database import get_connection
+from .formatting import fmt_clock, fmt_day
 
 
 # Standard PD symptoms with descriptions
@@ -78,18 +83,20 @@ def log_symptom(
     return symptom_id
 
 
-def log_quick_state(on_off_state: str, notes: str = None) -> int:
+def log_quick_state(on_off_state: str, notes: str = None,
+                    timestamp: datetime = None) -> int:
     """
     Quick log of just on/off state.
 
     Args:
         on_off_state: 'on', 'off', or 'transitioning'
         notes: Optional notes
+        timestamp: When the state was observed (defaults to now)
 
     Returns:
         The ID of the new symptom record
     """
-    return log_symptom(on_off_state=on_off_state, notes=notes)
+    return log_symptom(on_off_state=on_off_state, notes=notes, timestamp=timestamp)
 
 
 def get_symptoms_today() -> list:
@@ -177,22 +184,31 @@ def get_on_off_summary_today() -> dict:
     Returns:
         Dict with counts of each state
     """
-    symptoms = get_symptoms_today()
+    return summarize_on_off(get_symptoms_today())
+
+
+def summarize_on_off(symptoms: list) -> dict:
+    """
+    Count on/off states in already-loaded symptom records.
+
+    Args:
+        symptoms: Symptom records, most recent first (e.g. from get_symptoms_today())
+
+    Returns:
+        Dict with counts of each state, plus the most recent state and time
+    """
+    # Counter does the tallying in C instead of a Python loop
+    counts = Counter(s['on_off_state'] for s in symptoms)
 
     summary = {
-        'on': 0,
-        'off': 0,
-        'transitioning': 0,
+        'on': counts['on'],
+        'off': counts['off'],
+        'transitioning': counts['transitioning'],
         'total_entries': len(symptoms),
         'last_state': None,
         'last_time': None,
     }
 
-    for s in symptoms:
-        state = s['on_off_state']
-        if state in summary:
-            summary[state] += 1
-
     if symptoms:
         summary['last_state'] = symptoms[0]['on_off_state']
         summary['last_time'] = symptoms[0]['timestamp']
@@ -296,8 +312,8 @@ def format_symptom_entry(symptom: dict) -> str:
     lines = []
 
     # Time
-    ts = datetime.fromisoformat(symptom['timestamp'])
-    lines.append(f"  {ts.strftime('%I:%M %p').lstrip('0')} - {ts.strftime('%b %d')}")
+    ts = symptom['timestamp']
+    lines.append(f"  {fmt_clock(ts)} - {fmt_day(ts, '%b %d')}")
 
     # On/Off state
     state = symptom['on_off_state']
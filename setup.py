@@ -24,7 +24,6 @@ setup(
     # Dependencies - same as requirements.txt
     install_requires=[
         "click>=8.0.0",
-        "tabulate>=0.9.0",
     ],
 
     # This creates the 'pd' command
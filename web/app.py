@@ -19,6 +19,7 @@ from datetime import datetime, date, timedelta
 
 # Import our tracking modules
 from pd_tracker.database import init_database
+from pd_tracker.formatting import fmt_clock
 from pd_tracker.models import (
     get_all_medications,
     get_medication_by_id,
@@ -86,7 +87,6 @@ from pd_tracker.schedules import (
     SCHEDULE_TYPES,
     INTERVAL_OPTIONS,
 )
-from pd_tracker.export import export_pdf, export_excel, export_csv
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -109,7 +109,7 @@ def time12_filter(dt_string):
         dt = datetime.fromisoformat(dt_string)
     else:
         dt = dt_string
-    return dt.strftime("%I:%M %p").lstrip('0')
+    return fmt_clock(dt)
 
 
 @app.template_filter('dateformat')
@@ -835,11 +835,11 @@ def prepare_correlation_data(doses, symptoms, schedules, start_date, end_date, v
 
             # Count doses in this hour
             hour_doses = [d for d in doses
-                         if current <= datetime.fromisoformat(d['taken_time']) < hour_end]
+                         if current <= d['taken_time'] < hour_end]
 
             # Count symptoms in this hour
             hour_symptoms = [s for s in symptoms
-                            if current <= datetime.fromisoformat(s['timestamp']) < hour_end]
+                            if current <= s['timestamp'] < hour_end]
 
             on_count = sum(1 for s in hour_symptoms if s['on_off_state'] == 'on')
             off_count = sum(1 for s in hour_symptoms if s['on_off_state'] == 'off')
@@ -863,11 +863,11 @@ def prepare_correlation_data(doses, symptoms, schedules, start_date, end_date, v
 
             # Count doses this day
             day_doses = [d for d in doses
-                        if day_start <= datetime.fromisoformat(d['taken_time']) <= day_end]
+                        if day_start <= d['taken_time'] <= day_end]
 
             # Count symptoms this day
             day_symptoms = [s for s in symptoms
-                           if day_start <= datetime.fromisoformat(s['timestamp']) <= day_end]
+                           if day_start <= s['timestamp'] <= day_end]
 
             on_count = sum(1 for s in day_symptoms if s['on_off_state'] == 'on')
             off_count = sum(1 for s in day_symptoms if s['on_off_state'] == 'off')
@@ -897,6 +897,10 @@ def reports():
 @app.route('/reports/generate', methods=['POST'])
 def reports_generate():
     """Generate a report."""
+    # Imported here because openpyxl/reportlab are slow to load and
+    # only this page needs them
+    from pd_tracker.export import export_pdf, export_excel, export_csv
+
     format_type = request.form.get('format', 'pdf')
     days = request.form.get('days', 7, type=int)
 